@@ -1,11 +1,34 @@
+import time
+
+IMPORT_STARTED_AT = time.perf_counter()
+
 import os
+import asyncio
+import aiohttp
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
-from config import GUILD_ID
+from config import GUILD_ID, LOCAL_STORE_ENABLED
+from utils.sheets_gateway import sheets_gateway
+from utils.ledger import ledger
+from utils.log_utils import log_queue, log_alert
+from utils.sheets import init_sheets, init_timings
+from utils.store import point_store
+from utils.store_sync import sync_store, run_store_sync
+from utils.change_poller import run_change_poller
+from utils.helpers import username_cache_stats
+from utils.leaderboard import leaderboard_cache
+from utils.locks import sheet_locks
+from utils.metrics import metrics
+from utils.parsers import parsed_logs
+from utils.rate_limit import quota_accountant
+from utils.sheets import mirrors, quota_snapshot
+
+IMPORT_MS = (time.perf_counter() - IMPORT_STARTED_AT) * 1000
 
 load_dotenv()
 DISCORD_TOKEN = os.getenv('DISCORD_TOKEN')
+EVENT_LOG_WEBHOOK = os.getenv('EVENT_LOG_WEBHOOK')
 
 class Client(commands.Bot):
     def __init__(self, command_prefix, intents):
@@ -14,8 +37,72 @@ class Client(commands.Bot):
             intents=intents,
             help_command=None,
         )
+        self.before_invoke(self._start_command_metrics)
+        self.after_invoke(self._finish_command_metrics)
+        self.add_listener(self._record_command_error, "on_command_error")
+
+    async def _start_command_metrics(self, ctx):
+        ctx.metrics_started_at = time.perf_counter()
+        metrics.start_command(ctx.command.qualified_name)
+
+    async def _finish_command_metrics(self, ctx):
+        started_at = getattr(ctx, "metrics_started_at", None)
+        if started_at is not None:
+            ctx.metrics_started_at = None
+            metrics.finish_command(ctx.command.qualified_name, (time.perf_counter() - started_at) * 1000)
+
+    async def _record_command_error(self, ctx, error):
+        # Prefix invocations were timed by the after-invoke hook already; slash
+        # invocations skip that hook when the command raises.
+        if ctx.command is None:
+            return
+        started_at = getattr(ctx, "metrics_started_at", None)
+        ctx.metrics_started_at = None
+        elapsed_ms = (time.perf_counter() - started_at) * 1000 if started_at is not None else None
+        metrics.finish_command(ctx.command.qualified_name, elapsed_ms, failed=True)
 
     async def setup_hook(self):
+        await sheets_gateway.run(init_sheets)
+        init_timings["import_ms"] = round(IMPORT_MS, 2)
+        print(f"Startup timings: {init_timings}")
+
+        metrics.instrument_discord_http(self.http)
+        for name, source in {
+            "sheets_gateway": sheets_gateway.stats,
+            "mirror_main": mirrors["Main"].stats,
+            "mirror_officer": mirrors["Officer"].stats,
+            "quota_snapshot": quota_snapshot.stats,
+            "parsed_logs": parsed_logs.stats,
+            "usernames": lambda: dict(username_cache_stats),
+            "sheet_locks": sheet_locks.stats,
+            "ledger": ledger.stats,
+            "log_queue": log_queue.stats,
+            "sheets_quota": quota_accountant.stats,
+            "leaderboard": leaderboard_cache.stats,
+        }.items():
+            metrics.register_source(name, source)
+        if LOCAL_STORE_ENABLED:
+            metrics.register_source("store", point_store.stats)
+        self.metrics_exporter = asyncio.create_task(metrics.run_exporter())
+        log_queue.start(self)
+        quota_accountant.on_low(
+            lambda kind, remaining, quota: self.loop.call_soon_threadsafe(self._warn_quota_low, kind, remaining, quota)
+        )
+
+        self.ledger_flusher = asyncio.create_task(ledger.run_flusher(sheets_gateway))
+        self.change_poller = asyncio.create_task(run_change_poller(sheets_gateway))
+        self.leaderboard_refresher = asyncio.create_task(leaderboard_cache.run_refresher(sheets_gateway))
+        self.store_sync = None
+        if LOCAL_STORE_ENABLED:
+            print(f"Local store pulled: {await sync_store(sheets_gateway)}")
+            self.store_sync = asyncio.create_task(run_store_sync(sheets_gateway))
+
+        self.http_session = aiohttp.ClientSession()
+        self.event_log_webhook = (
+            discord.Webhook.from_url(EVENT_LOG_WEBHOOK, session=self.http_session)
+            if EVENT_LOG_WEBHOOK else None
+        )
+
         await self.load_extension('cogs.utilities')
         await self.load_extension('cogs.officers')
         await self.load_extension('cogs.events')
@@ -24,11 +111,45 @@ class Client(commands.Bot):
         await self.tree.sync(guild=guild)
         print(f"Commands synced to guild {GUILD_ID}")
 
+    def _warn_quota_low(self, kind, remaining, quota):
+        print(f"Sheets {kind} budget low: {remaining}/{quota} requests left this minute")
+        log_alert(
+            self,
+            title="Sheets Quota Low",
+            description=(
+                f"Only **{remaining}/{quota}** {kind} requests left in the current minute.\n"
+                "Leaderboard refreshes, colour snapshots and background syncs are deferred until it recovers."
+            ),
+        )
+
+    async def close(self):
+        self.ledger_flusher.cancel()
+        self.change_poller.cancel()
+        self.leaderboard_refresher.cancel()
+        self.metrics_exporter.cancel()
+        try:
+            await ledger.flush(sheets_gateway)
+        except Exception as e:
+            print(f"Final ledger flush failed, deltas stay pending: {e}")
+        if self.store_sync:
+            self.store_sync.cancel()
+            await sync_store(sheets_gateway)
+        await log_queue.close()
+        await super().close()
+        await self.http_session.close()
+        sheets_gateway.shutdown()
+        ledger.close()
+        point_store.close()
+
     async def on_ready(self):
         print(f'Logged in as {self.user} (ID: {self.user.id})')
+        if "ready_ms" not in init_timings:
+            init_timings["ready_ms"] = round((time.perf_counter() - IMPORT_STARTED_AT) * 1000, 2)
+            print(f"Cold start took {init_timings['ready_ms']:.0f}ms")
 
 intents = discord.Intents.default()
 intents.message_content = True
+intents.members = True
 
 client = Client(command_prefix="-", intents=intents)
 
@@ -0,0 +1,252 @@
+"""
+End-to-end load benchmark of `logevent` and `logtime` against the in-process
+fake spreadsheet in `benchmarks.fake_sheets`.
+
+Each iteration runs the real command callback with stand-in Discord objects,
+then flushes the point ledger to the fake sheet, and records the Sheets
+requests it made, its latency and how long the event loop was stalled.
+
+Run from the repository root with `python -m benchmarks.bench_logevent`
+(`--help` lists latency, 429 injection and attendee-count options).
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+
+import config
+
+config.LEDGER_PATH = os.path.join(tempfile.mkdtemp(prefix="cglogger-bench-"), "ledger.db")
+
+from benchmarks.fake_sheets import FakeSheetsSession, build_database, install
+from cogs.officers import Officers
+from utils.helpers import _username_cache
+from utils.ledger import ledger
+from utils.parsers import parse_activity_log, parse_event_log, parsed_logs
+from utils.rate_limit import sheets_bucket
+from utils.sheets_gateway import sheets_gateway
+
+HOST_ID = 900001
+MEMBER_ID_BASE = 100000
+DEFAULT_SIZES = [1, 10, 25, 50, 100]
+
+class FakeAvatar:
+    url = "https://cdn.discordapp.com/embed/avatars/0.png"
+
+class FakeMember:
+    def __init__(self, user_id, nick):
+        self.id = user_id
+        self.name = nick.split("|")[1].strip() if "|" in nick else nick
+        self.nick = nick
+        self.display_name = nick
+        self.mention = f"<@{user_id}>"
+        self.display_avatar = FakeAvatar()
+        self.bot = False
+
+class FakeGuild:
+    """Guild whose member cache holds the host officer and every sheet member."""
+
+    def __init__(self, members: int):
+        self.id = config.GUILD_ID
+        self.name = "Coruscant Guard (bench)"
+        self._members = {HOST_ID: FakeMember(HOST_ID, "[XO] | officer1 | BRT")}
+        for n in range(1, members + 1):
+            self._members[MEMBER_ID_BASE + n] = FakeMember(MEMBER_ID_BASE + n, f"[ST] | member{n} | EST")
+
+    def get_member(self, user_id):
+        return self._members.get(user_id)
+
+    async def query_members(self, user_ids, limit):
+        return [self._members[user_id] for user_id in user_ids if user_id in self._members]
+
+    async def fetch_member(self, user_id):
+        return self._members[user_id]
+
+class FakeSentMessage:
+    async def delete(self, delay=None):
+        pass
+
+class FakeChannel:
+    def __init__(self, name, discord_calls):
+        self.id = 1
+        self.name = name
+        self.mention = f"#{name}"
+        self._discord_calls = discord_calls
+        self.messages = {}
+
+    async def send(self, *args, **kwargs):
+        self._discord_calls["send"] += 1
+        return FakeSentMessage()
+
+    async def fetch_message(self, message_id):
+        self._discord_calls["fetch_message"] += 1
+        return self.messages[message_id]
+
+class FakeMessage:
+    def __init__(self, message_id, content, author, attachments):
+        self.id = message_id
+        self.content = content
+        self.author = author
+        self.attachments = attachments
+        self.reactions = []
+        self.jump_url = f"https://discord.com/channels/0/0/{message_id}"
+
+    async def add_reaction(self, emoji):
+        pass
+
+    async def delete(self, delay=None):
+        pass
+
+def event_message(attendees: int) -> str:
+    mentions = " ".join(f"<@{MEMBER_ID_BASE + n}>" for n in range(1, attendees + 1))
+    return (
+        "Event: Bench Patrol\n"
+        f"Hosted by: <@{HOST_ID}>\n"
+        f"Attendees: {mentions}\n"
+        "Proof: attached-image.jpg\n"
+        "EP for event: 2"
+    )
+
+def activity_message(member: int) -> str:
+    return (
+        f"Username: <@{MEMBER_ID_BASE + member}>\n"
+        "Time Started: 6:17pm EST\n"
+        "Time Ended: 7:42pm EST\n"
+        "Time logged: 85\n"
+        "Total time logged: 85\n"
+        "Proof: attached-image1.jpg, attached-image2.jpg"
+    )
+
+class StallMonitor:
+    """Measure how late a 1 ms heartbeat on the event loop wakes up."""
+
+    def __init__(self, tick: float = 0.001):
+        self.tick = tick
+        self.max_stall = 0.0
+        self.total_stall = 0.0
+        self._task = None
+
+    async def _run(self):
+        while True:
+            started_at = time.perf_counter()
+            await asyncio.sleep(self.tick)
+            late = time.perf_counter() - started_at - self.tick
+            self.max_stall = max(self.max_stall, late)
+            if late > self.tick:
+                self.total_stall += late
+
+    def reset(self):
+        self.max_stall = 0.0
+        self.total_stall = 0.0
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        self._task.cancel()
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+async def run_command(cog, callback, channel, guild, message, parse):
+    """Run one command callback as a reply to `message`, then flush the ledger."""
+    parsed_logs.put(message, parse(message.content))
+    channel.messages[message.id] = message
+    host = guild.get_member(HOST_ID)
+    ctx = SimpleNamespace(
+        message=SimpleNamespace(reference=SimpleNamespace(message_id=message.id, resolved=None), delete=FakeSentMessage().delete),
+        channel=channel,
+        guild=guild,
+        author=host,
+        interaction=None,
+        send=channel.send,
+    )
+    started_at = time.perf_counter()
+    await callback(cog, ctx)
+    command_done_at = time.perf_counter()
+    await ledger.flush(sheets_gateway)
+    return command_done_at - started_at, time.perf_counter() - command_done_at
+
+async def bench(args):
+    session = FakeSheetsSession(
+        build_database(),
+        latency=args.latency / 1000,
+        rate_limit_every=args.rate_limit_every,
+        rate_limit_chance=args.rate_limit_chance,
+        retry_after=args.retry_after,
+    )
+    install(session)
+    sheets_bucket.capacity = args.quota_per_minute
+    sheets_bucket.rate = args.quota_per_minute / 60
+    sheets_bucket.tokens = float(args.quota_per_minute)
+
+    discord_calls = {"send": 0, "fetch_message": 0}
+    channel = FakeChannel("bench-event-logs", discord_calls)
+    guild = FakeGuild(max(args.sizes))
+    bot = SimpleNamespace(
+        event_log_webhook=None,
+        loop=asyncio.get_running_loop(),
+        user=guild.get_member(HOST_ID),
+        get_channel=lambda channel_id: channel,
+    )
+    cog = Officers(bot)
+    monitor = StallMonitor()
+    monitor.start()
+
+    await run_command(cog, Officers.logevent.callback, channel, guild,
+                      FakeMessage(1, event_message(1), guild.get_member(HOST_ID), [SimpleNamespace(content_type="image/png")]),
+                      lambda content: parse_event_log(content, "EP"))
+
+    cases = [(f"logevent x{size}", size) for size in args.sizes] + [("logtime", None)]
+    print(f"{'case':<16}{'p50 ms':>9}{'p99 ms':>9}{'flush ms':>10}{'calls/op':>10}{'429s':>6}{'stall max ms':>14}{'stall ms/op':>13}")
+    message_id = 1000
+    for name, size in cases:
+        session.reset_counters()
+        monitor.reset()
+        totals, flushes = [], []
+        for _ in range(args.iterations):
+            _username_cache.clear()
+            message_id += 1
+            if size is None:
+                message = FakeMessage(message_id, activity_message(message_id % max(args.sizes) + 1), guild.get_member(HOST_ID),
+                                      [SimpleNamespace(content_type="image/png")] * 2)
+                command, flush = await run_command(cog, Officers.logtime.callback, channel, guild, message, parse_activity_log)
+            else:
+                message = FakeMessage(message_id, event_message(size), guild.get_member(HOST_ID),
+                                      [SimpleNamespace(content_type="image/png")])
+                command, flush = await run_command(cog, Officers.logevent.callback, channel, guild, message,
+                                                   lambda content: parse_event_log(content, "EP"))
+            totals.append((command + flush) * 1000)
+            flushes.append(flush * 1000)
+        print(
+            f"{name:<16}{percentile(totals, 0.5):>9.1f}{percentile(totals, 0.99):>9.1f}"
+            f"{statistics.mean(flushes):>10.1f}{session.requests / args.iterations:>10.1f}{session.rate_limited:>6}"
+            f"{monitor.max_stall * 1000:>14.1f}{monitor.total_stall * 1000 / args.iterations:>13.2f}"
+        )
+        if args.verbose:
+            print(f"    {dict(session.calls)}")
+
+    monitor.stop()
+    for task in asyncio.all_tasks():
+        if task is not asyncio.current_task():
+            task.cancel()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20, help="runs per case")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="attendee counts")
+    parser.add_argument("--latency", type=float, default=0.0, help="fake Sheets latency per request, in ms")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="answer every Nth request with a 429")
+    parser.add_argument("--rate-limit-chance", type=float, default=0.0, help="probability of a 429 per request")
+    parser.add_argument("--retry-after", type=float, default=None, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--quota-per-minute", type=int, default=100000, help="token bucket size for the run")
+    parser.add_argument("--verbose", action="store_true", help="print the request mix of every case")
+    asyncio.run(bench(parser.parse_args()))
+    sheets_gateway.shutdown()
+
+if __name__ == "__main__":
+    main()
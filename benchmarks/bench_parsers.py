@@ -0,0 +1,114 @@
+"""
+Micro-benchmark of event/activity log parsing: the per-field `re.search`
+approach `logevent`/`logtime` used before `utils.parsers`, against the
+single-pass parser. Before timing, the parser is checked against the log
+layouts the old regexes accepted (values on the line after their label,
+bullet-prefixed fields).
+
+Run from the repository root with `python -m benchmarks.bench_parsers`.
+"""
+import re
+import timeit
+from utils.parsers import parse_event_log, parse_activity_log
+
+ATTENDEES = " ".join(f"<@{100000000000000000 + i}>" for i in range(30))
+
+EVENT_MESSAGE = (
+    "Event: Weekly Meetup\n"
+    "Hosted by: <@200000000000000001>\n"
+    "Supervisor: [XO] | SupervisorName | BRT\n"
+    "Co-host: <@200000000000000002>\n"
+    f"Attendees: {ATTENDEES}\n"
+    "Notes: Regular weekly meeting\n"
+    "Proof: attached-image.jpg\n"
+    "EP for event: 2\n"
+    "Extra points: <@100000000000000001> (2) <@100000000000000002> (1)\n"
+    "Ping: <@&300000000000000000>"
+)
+
+ACTIVITY_MESSAGE = (
+    "Username: <@100000000000000001>\n"
+    "Time Started: 6:17pm EST\n"
+    "Time Ended: 7:42pm EST\n"
+    "Time logged: 85\n"
+    "Total time logged: 85\n"
+    "Proof: attached-image1.jpg, attached-image2.jpg"
+)
+
+def legacy_event(content, point_type="EP"):
+    """The field extraction `logevent` did inline, without member lookups."""
+    required_fields = ["Event:", "Hosted by:", "Attendees:", "Proof:", f"{point_type} for event:"]
+    missing = [f for f in required_fields if f not in content]
+    ep_match = re.search(rf"{point_type} for event:\s*(\d+)|{point_type} for Event:\s*(\d+)", content, re.IGNORECASE)
+    event_match = re.search(r"Event:\s*(.+)", content)
+    host_match = re.search(r"Hosted by:\s*(.+)", content)
+    host_mention = re.search(r"<@!?(\d+)>", host_match.group(1)) if host_match else None
+    supervisor_match = re.search(r"Supervisor:\s*(.+)", content)
+    supervisor_mention = re.search(r"<@!?(\d+)>", supervisor_match.group(1)) if supervisor_match else None
+    cohost_match = re.search(r"Co-host:\s*(.+)", content)
+    cohost_mention = re.search(r"<@!?(\d+)>", cohost_match.group(1)) if cohost_match else None
+    attendees_match = re.search(r"Attendees:\s*(.*)", content)
+    attendees = re.findall(r"<@!?(\d+)>", attendees_match.group(1)) if attendees_match else []
+    extra_points_match = re.search(r"Extra points:\s*(.*)", content)
+    extra_points = re.findall(r"<@!?(\d+)>\s*\((\d+)\)", extra_points_match.group(1)) if extra_points_match else []
+    return missing, ep_match, event_match, host_mention, supervisor_mention, cohost_mention, attendees, extra_points
+
+def legacy_activity(content):
+    """The field extraction `on_message` and `logtime` did inline."""
+    required_fields = ["Username:", "Time Started:", "Time Ended:", "Time logged:", "Total time logged:", "Proof:"]
+    missing = [f for f in required_fields if f not in content]
+    username_match = re.search(r"Username:\s*(<@!?(\d+)>|\S+)", content)
+    time_logged_match = re.search(r"Time logged:\s*(\d+)", content)
+    return missing, username_match, time_logged_match
+
+CASES = [
+    ("event log (legacy)", lambda: legacy_event(EVENT_MESSAGE)),
+    ("event log (parser)", lambda: parse_event_log(EVENT_MESSAGE, "EP")),
+    ("activity log (legacy)", lambda: legacy_activity(ACTIVITY_MESSAGE)),
+    ("activity log (parser)", lambda: parse_activity_log(ACTIVITY_MESSAGE)),
+]
+
+LAYOUT_CASES = [
+    (
+        "attendees on the next lines",
+        "Event: Patrol\nHosted by: <@1>\nAttendees:\n<@2> <@3>\n<@4>\nProof: img.jpg\nEP for event: 2",
+        lambda record: not record.missing and record.attendee_ids == [2, 3, 4] and record.point_value == 2,
+    ),
+    (
+        "bullet-prefixed event",
+        "- Event: Patrol\n• Hosted by: <@1>\n* Attendees: <@2>\n> Proof: img.jpg\n- **EP for event:** 3",
+        lambda record: not record.missing and record.host_id == 1 and record.attendee_ids == [2] and record.point_value == 3,
+    ),
+]
+
+ACTIVITY_LAYOUT_CASES = [
+    (
+        "activity values on the next line",
+        "Username:\n<@5>\nTime Started: 6:17pm EST\nTime Ended: 7:42pm EST\nTime logged:\n85\n"
+        "Total time logged: 85\nProof: a.jpg, b.jpg",
+        lambda record: not record.missing and record.username_id == 5 and record.time_logged == 85,
+    ),
+    (
+        "bullet-prefixed activity",
+        "- Username: <@5>\n- Time Started: 6pm\n- Time Ended: 7pm\n- Time logged: 60\n- Total time logged: 60\n- Proof: a.jpg",
+        lambda record: not record.missing and record.username_id == 5 and record.time_logged == 60,
+    ),
+]
+
+def check_layouts():
+    """Fail loudly if the parser rejects a layout the legacy regexes accepted."""
+    results = [(name, check(parse_event_log(content, "EP"))) for name, content, check in LAYOUT_CASES]
+    results += [(name, check(parse_activity_log(content))) for name, content, check in ACTIVITY_LAYOUT_CASES]
+    for name, ok in results:
+        print(f"{name:<36} {'ok' if ok else 'FAILED'}")
+    if not all(ok for _, ok in results):
+        raise SystemExit("parser regression")
+
+def main(number: int = 20000):
+    check_layouts()
+    for name, func in CASES:
+        best = min(timeit.repeat(func, number=number, repeat=5)) / number
+        print(f"{name:<24} {best * 1e6:8.2f} µs/op")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+In-process stand-in for the Sheets v4 endpoints gspread uses, backed by an
+in-memory grid with the real section layout of the CG database.
+
+`FakeSheetsSession` replaces the authorized HTTP session under gspread, so the
+bot's `ThrottledHTTPClient`, handle pool, mirrors and batch helpers run
+unchanged; every request is counted, can be delayed by a fixed latency, and can
+be answered with a 429 to exercise the retry path.
+
+    session = FakeSheetsSession(build_database(), latency=0.08, rate_limit_every=50)
+    install(session)
+"""
+import random
+import threading
+import time
+from collections import Counter
+from json import dumps
+from urllib.parse import unquote, urlparse
+import gspread
+from gspread.utils import a1_range_to_grid_range
+import utils.sheets as sheets_module
+from utils.sheets import MAIN_SHEET_HEADER_ROWS, USERNAME_COLUMN, ThrottledHTTPClient
+
+MAIN_HEADERS = ["EP", "CEP", "In-game Time", "Total EP", "Total CEP", "Supervisor", "Co-host"]
+OFFICER_HEADERS = ["OP", "Events Hosted", "Company Events Hosted", "Supervisor", "Co-host"]
+OFFICER_HEADER_ROW = 3
+MAIN_SHEET_ROWS = 220
+LEADERBOARD_FIRST_ROW = 6
+
+def _header_row(headers):
+    return [""] * (USERNAME_COLUMN - 1) + ["Username"] + list(headers)
+
+def build_database(officers: int = 30):
+    """
+    Return {worksheet title: rows} shaped like the real spreadsheet: Main Sheet
+    sections headed at MAIN_SHEET_HEADER_ROWS with members between them, an
+    Officer Sheet, and a Leaderboard tab. Members are named "member1".."memberN"
+    in sheet order and officers "officer1".."officerN".
+    """
+    main = [[] for _ in range(MAIN_SHEET_ROWS)]
+    bounds = MAIN_SHEET_HEADER_ROWS[1:] + [MAIN_SHEET_ROWS + 1]
+    member = 0
+    for header_row, next_header_row in zip(MAIN_SHEET_HEADER_ROWS, bounds):
+        main[header_row - 1] = _header_row(MAIN_HEADERS)
+        for row_index in range(header_row + 1, next_header_row):
+            member += 1
+            main[row_index - 1] = [""] * (USERNAME_COLUMN - 1) + [f"member{member}"] + ["0", "0", "0", "0", "0", "0", "0"]
+
+    officer = [[] for _ in range(OFFICER_HEADER_ROW + officers)]
+    officer[OFFICER_HEADER_ROW - 1] = _header_row(OFFICER_HEADERS)
+    for n in range(1, officers + 1):
+        officer[OFFICER_HEADER_ROW + n - 1] = [""] * (USERNAME_COLUMN - 1) + [f"officer{n}", "0", "0", "0", "0", "0"]
+
+    leaderboard = [[] for _ in range(LEADERBOARD_FIRST_ROW - 1)]
+    leaderboard += [[str(n), f"member{n}", str(100 - n)] for n in range(1, 11)]
+
+    return {"Main Sheet": main, "Officer Sheet": officer, "Leaderboard": leaderboard}
+
+class FakeResponse:
+    """The subset of `requests.Response` gspread and `utils.rate_limit` read."""
+
+    def __init__(self, status_code: int, payload: dict, headers: dict = None):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.reason = "OK" if self.ok else "Error"
+        self.headers = headers or {}
+        self._payload = payload
+        self.text = dumps(payload)
+        self.content = self.text.encode("utf-8")
+
+    def json(self):
+        return self._payload
+
+class FakeSheetsSession:
+    """
+    Serve the Sheets v4 requests gspread makes from an in-memory grid.
+
+    :param worksheets: {title: rows}, e.g. from `build_database()`.
+    :param latency: Seconds every request blocks the calling thread for.
+    :param rate_limit_every: Answer every Nth request with a 429, or 0 to never.
+    :param rate_limit_chance: Probability of answering any request with a 429.
+    :param retry_after: Retry-After header sent with injected 429s, or None.
+    :param seed: Seed of the 429 coin flips.
+    """
+
+    def __init__(
+        self,
+        worksheets: dict,
+        latency: float = 0.0,
+        rate_limit_every: int = 0,
+        rate_limit_chance: float = 0.0,
+        retry_after: float = None,
+        seed: int = 0,
+    ):
+        self.grid = {title: [list(row) for row in rows] for title, rows in worksheets.items()}
+        self.sheet_ids = {title: index for index, title in enumerate(self.grid)}
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.rate_limit_chance = rate_limit_chance
+        self.retry_after = retry_after
+        self.calls = Counter()
+        self.requests = 0
+        self.rate_limited = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.headers = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def reset_counters(self):
+        with self._lock:
+            self.calls.clear()
+            self.requests = 0
+            self.rate_limited = 0
+            self.bytes_sent = 0
+            self.bytes_received = 0
+
+    def request(self, method, url, json=None, params=None, data=None, files=None, headers=None, timeout=None):
+        if self.latency:
+            time.sleep(self.latency)
+        path = unquote(urlparse(url).path).split("/v4/spreadsheets/", 1)[1]
+        kind = self._kind(method, path)
+        with self._lock:
+            self.requests += 1
+            self.calls[kind] += 1
+            self.bytes_sent += len(dumps(json)) if json else 0
+            throttled = (
+                (self.rate_limit_every and self.requests % self.rate_limit_every == 0)
+                or (self.rate_limit_chance and self._random.random() < self.rate_limit_chance)
+            )
+            if throttled:
+                self.rate_limited += 1
+                return self._error(429, "Quota exceeded for quota metric 'Read requests'", "RESOURCE_EXHAUSTED")
+            payload = self._handle(kind, path, json or {}, params or {})
+            response = FakeResponse(200, payload)
+            self.bytes_received += len(response.content)
+            return response
+
+    def _error(self, code, message, status):
+        headers = {"Retry-After": str(self.retry_after)} if self.retry_after is not None else {}
+        return FakeResponse(code, {"error": {"code": code, "message": message, "status": status}}, headers)
+
+    @staticmethod
+    def _kind(method, path):
+        if path.endswith("values:batchGet"):
+            return "values.batchGet"
+        if path.endswith("values:batchUpdate"):
+            return "values.batchUpdate"
+        if path.endswith(":batchUpdate"):
+            return "spreadsheets.batchUpdate"
+        if "/values/" in path:
+            return "values.append" if path.endswith(":append") else f"values.{method.lower()}"
+        return "spreadsheets.get"
+
+    def _handle(self, kind, path, body, params):
+        if kind == "spreadsheets.get":
+            return self._metadata(params)
+        if kind == "values.get":
+            return self._value_range(path.split("/values/", 1)[1])
+        if kind == "values.batchGet":
+            ranges = params.get("ranges", [])
+            ranges = [ranges] if isinstance(ranges, str) else ranges
+            return {"valueRanges": [self._value_range(r) for r in ranges]}
+        if kind == "values.batchUpdate":
+            for value_range in body.get("data", []):
+                self._write(value_range["range"], value_range["values"])
+            return {"totalUpdatedCells": len(body.get("data", []))}
+        if kind in ("values.put", "values.append"):
+            self._write(path.split("/values/", 1)[1].rsplit(":append", 1)[0], body.get("values", []))
+            return {}
+        if kind == "spreadsheets.batchUpdate":
+            for request in body.get("requests", []):
+                if "insertDimension" in request:
+                    grid_range = request["insertDimension"]["range"]
+                    title = self._title(grid_range["sheetId"])
+                    for _ in range(grid_range["endIndex"] - grid_range["startIndex"]):
+                        self.grid[title].insert(grid_range["startIndex"], [])
+            return {"replies": [{} for _ in body.get("requests", [])]}
+        return {}
+
+    def _title(self, sheet_id):
+        return next(title for title, index in self.sheet_ids.items() if index == sheet_id)
+
+    def _metadata(self, params):
+        sheets = []
+        ranges = params.get("ranges")
+        for title, rows in self.grid.items():
+            sheet = {"properties": {
+                "sheetId": self.sheet_ids[title],
+                "title": title,
+                "index": self.sheet_ids[title],
+                "sheetType": "GRID",
+                "gridProperties": {"rowCount": max(len(rows), 1000), "columnCount": 26},
+            }}
+            if ranges and str(params.get("includeGridData")).lower() == "true":
+                range_title, bounds = self._parse_range(ranges if isinstance(ranges, str) else ranges[0])
+                if range_title != title:
+                    continue
+                sheet["data"] = [{"rowData": [
+                    {"values": [{"formattedValue": value} if value else {} for value in row]}
+                    for row in self._slice(title, bounds)
+                ]}]
+            sheets.append(sheet)
+        return {"spreadsheetId": "fake", "properties": {"title": "CG Database (fake)", "locale": "en_US"}, "sheets": sheets}
+
+    @staticmethod
+    def _parse_range(range_name):
+        if "!" in range_name:
+            title, a1 = range_name.rsplit("!", 1)
+        else:
+            title, a1 = range_name, None
+        title = title.strip("'").replace("''", "'")
+        return title, a1_range_to_grid_range(a1) if a1 else {}
+
+    def _slice(self, title, bounds):
+        rows = self.grid[title]
+        first_row = bounds.get("startRowIndex", 0)
+        last_row = bounds.get("endRowIndex", len(rows))
+        first_col = bounds.get("startColumnIndex", 0)
+        last_col = bounds.get("endColumnIndex")
+        out = []
+        for row in rows[first_row:last_row]:
+            cells = list(row[first_col:last_col])
+            while cells and not cells[-1]:
+                cells.pop()
+            out.append(cells)
+        while out and not out[-1]:
+            out.pop()
+        return out
+
+    def _value_range(self, range_name):
+        title, bounds = self._parse_range(range_name)
+        values = self._slice(title, bounds)
+        return {"range": range_name, "majorDimension": "ROWS", **({"values": values} if values else {})}
+
+    def _write(self, range_name, values):
+        title, bounds = self._parse_range(range_name)
+        rows = self.grid[title]
+        first_row = bounds.get("startRowIndex", 0)
+        first_col = bounds.get("startColumnIndex", 0)
+        for r, row_values in enumerate(values):
+            while len(rows) <= first_row + r:
+                rows.append([])
+            row = rows[first_row + r]
+            for c, value in enumerate(row_values):
+                while len(row) <= first_col + c:
+                    row.append("")
+                row[first_col + c] = "" if value is None else str(value)
+
+    def cell(self, title, username, header):
+        """Return the current value of `username`'s `header` cell, for checking results."""
+        rows = self.grid[title]
+        header_row = None
+        for row in rows:
+            if header in row and "Username" in row:
+                header_row = row
+            elif header_row and len(row) >= USERNAME_COLUMN and row[USERNAME_COLUMN - 1] == username:
+                col = header_row.index(header)
+                return row[col] if col < len(row) else ""
+        return None
+
+def install(session: FakeSheetsSession):
+    """Point `utils.sheets` at `session` and forget every cached handle and mirror."""
+    sheets_module.client = gspread.Client(None, session=session, http_client=ThrottledHTTPClient)
+    sheets_module.reset_handles()
+    for mirror in sheets_module.mirrors.values():
+        mirror.invalidate()
+    sheets_module.quota_snapshot.invalidate()
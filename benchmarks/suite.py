@@ -0,0 +1,184 @@
+"""
+Micro-benchmark suite for the bot's hot helpers, with a stored baseline.
+
+Every case is timed with `timeit` (best of many short samples) alternately
+with a fixed pure-Python calibration loop, and the case/calibration ratio is compared
+with `benchmarks/baseline.json`. Normalizing by the calibration loop cancels
+most of the drift of a busy or throttled machine. The run exits with status 1
+when a case's ratio is worse than its baseline by more than the threshold;
+suspected regressions are re-measured first, and the best run counts.
+Baselines still depend on the interpreter version, so refresh them after
+upgrading Python.
+
+Run from the repository root:
+
+    python -m benchmarks.suite                     # compare with the baseline
+    python -m benchmarks.suite --update-baseline   # record a new baseline
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+import config
+
+config.LEDGER_PATH = os.path.join(tempfile.mkdtemp(prefix="cglogger-bench-"), "ledger.db")
+
+from benchmarks.bench_parsers import ACTIVITY_MESSAGE, EVENT_MESSAGE
+from benchmarks.fake_sheets import build_database
+from utils.embed_utils import make_embed
+from utils.helpers import format_username
+from utils.parsers import parse_activity_log, parse_event_log
+from utils.sheets import _plan_point_updates, get_row_by_username, mirrors
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.25
+SAMPLE_SECONDS = 0.005
+CONFIRM_RUNS = 2
+
+class _Worksheet:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def get_all_values(self):
+        return [list(row) for row in self._rows]
+
+class _Member:
+    def __init__(self, nick, name):
+        self.nick = nick
+        self.name = name
+
+def load_mirrors():
+    """Load the sheet mirrors from the fake database so lookups never touch the network."""
+    database = build_database()
+    for mirror in mirrors.values():
+        mirror.load(_Worksheet(database[mirror.worksheet_name]))
+
+def point_updates(count: int) -> list:
+    """A logevent-sized update list: one officer host plus `count` attendees."""
+    def update(sheet, username, header):
+        return {
+            "sheet": sheet,
+            "worksheet_name": "Officer Sheet" if sheet == "Officer" else "Main Sheet",
+            "username": username,
+            "header": header,
+            "amount": 2,
+            "is_add": True,
+        }
+    updates = [update("Officer", "officer1", "OP"), update("Officer", "officer1", "Events Hosted")]
+    updates += [update("Main", f"member{n}", "EP") for n in range(1, count + 1)]
+    return updates
+
+def build_cases():
+    load_mirrors()
+    main_mirror = mirrors["Main"]
+    usernames = [f"member{n}" for n in range(1, 101)]
+    rows = [get_row_by_username("Main", username) for username in usernames]
+    members = [_Member(f"[ST] | {username} | EST", username) for username in usernames]
+    updates = point_updates(50)
+    attendee_list = "\n".join(f"member{n}" for n in range(1, 31))
+    return {
+        "parse_event_log (30 attendees)": lambda: parse_event_log(EVENT_MESSAGE, "EP"),
+        "parse_activity_log": lambda: parse_activity_log(ACTIVITY_MESSAGE),
+        "format_username x100": lambda: [format_username(member) for member in members],
+        "make_embed": lambda: make_embed(type="Success", title="Event Logged!", description=attendee_list),
+        "username lookup x100 (mirror)": lambda: [get_row_by_username("Main", username) for username in usernames],
+        "header lookup x100 (mirror)": lambda: [main_mirror.column_index(row, "Total EP") for row in rows],
+        "plan 50-attendee batch update": lambda: _plan_point_updates(updates),
+    }
+
+def calibration():
+    """Fixed workload mixing the operations the cases use: string splits, dict lookups and loops."""
+    index = {}
+    for n in range(200):
+        key = f"member{n}"
+        index[key] = len(key.split("m"))
+    return sum(index[f"member{n}"] for n in range(200))
+
+def _sized_timer(func):
+    """Return (timer, calls per sample) for samples of about SAMPLE_SECONDS."""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    return timer, max(1, int(number * SAMPLE_SECONDS / elapsed))
+
+def best_times(func, repeat):
+    """
+    Best seconds per call of `func` and of the calibration loop over `repeat`
+    short samples taken alternately, so both see the same machine conditions;
+    short samples make it likely that at least one of each ran undisturbed.
+    """
+    case_timer, case_number = _sized_timer(func)
+    reference_timer, reference_number = _sized_timer(calibration)
+    case_best = reference_best = float("inf")
+    for _ in range(repeat):
+        reference_best = min(reference_best, reference_timer.timeit(reference_number) / reference_number)
+        case_best = min(case_best, case_timer.timeit(case_number) / case_number)
+    return case_best, reference_best
+
+def measure(cases, repeat):
+    """Return {case: (µs per call, ratio to the calibration loop)}."""
+    results = {}
+    for name, func in cases.items():
+        elapsed, reference = best_times(func, repeat)
+        results[name] = (round(elapsed * 1e6, 3), round(elapsed / reference, 4))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of the bot's hot helpers.")
+    parser.add_argument("--update-baseline", action="store_true", help=f"write the results to {BASELINE_PATH.name}")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before a case fails, as a fraction (default %(default)s)")
+    parser.add_argument("--repeat", type=int, default=40, help="timings per case; the best one is kept")
+    args = parser.parse_args()
+
+    cases = build_cases()
+    results = measure(cases, args.repeat)
+
+    if args.update_baseline:
+        BASELINE_PATH.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cases": {name: {"us_per_op": us, "ratio": ratio} for name, (us, ratio) in results.items()},
+        }, indent=4) + "\n")
+        for name, (us, ratio) in results.items():
+            print(f"{name:<34} {us:10.2f} µs/op  ratio {ratio:8.3f}")
+        print(f"Baseline written to {BASELINE_PATH}")
+        return 0
+
+    baseline = json.loads(BASELINE_PATH.read_text())["cases"] if BASELINE_PATH.exists() else {}
+
+    def regressed(name):
+        reference = baseline.get(name)
+        return reference and results[name][1] / reference["ratio"] - 1 > args.threshold
+
+    for _ in range(CONFIRM_RUNS):
+        suspects = {name: cases[name] for name in results if regressed(name)}
+        if not suspects:
+            break
+        for name, (us, ratio) in measure(suspects, args.repeat).items():
+            if ratio < results[name][1]:
+                results[name] = (us, ratio)
+
+    regressions = []
+    for name, (us, ratio) in results.items():
+        reference = baseline.get(name)
+        if reference:
+            change = ratio / reference["ratio"] - 1
+            status = "REGRESSED" if change > args.threshold else "ok"
+            if status != "ok":
+                regressions.append(name)
+            print(f"{name:<34} {us:10.2f} µs/op  ratio {ratio:8.3f}  baseline {reference['ratio']:8.3f}  {change:+7.1%}  {status}")
+        else:
+            print(f"{name:<34} {us:10.2f} µs/op  ratio {ratio:8.3f}  (no baseline)")
+
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,12 +3,17 @@ from discord.ext import commands
 import re
 from config import ACTIVITY_CHANNEL, EVENT_LOG_CHANNELS
 from utils.embed_utils import make_embed
+from utils.helpers import forget_username
+from utils.parsers import parse_event_log, parse_activity_log, parsed_logs
 import asyncio
 
 class Events(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    def _is_company_channel(self, channel):
+        return any(kw in channel.name for kw in ["hound-event-logs", "riot-event-logs", "shock-event-logs"])
+
     @commands.Cog.listener()
     async def on_member_join(self, member):
         try:
@@ -35,6 +40,16 @@ class Events(commands.Cog):
         if channel:
             await channel.send(f"Welcome, {member.mention}!")
 
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        if before.nick != after.nick or before.name != after.name:
+            forget_username(after.id)
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before, after):
+        if before.name != after.name:
+            forget_username(after.id)
+
     @commands.Cog.listener()
     async def on_message(self, message):
         if message.author.bot or message.content.startswith("-"):
@@ -42,8 +57,8 @@ class Events(commands.Cog):
 
         if message.channel.id in [ACTIVITY_CHANNEL] + EVENT_LOG_CHANNELS:
             if message.channel.id == ACTIVITY_CHANNEL:
-                required_fields = ["Username:", "Time Started:", "Time Ended:", "Time logged:", "Total time logged:", "Proof:"]
-                if any(f not in message.content for f in required_fields) or len(message.attachments) < 2:
+                record = parse_activity_log(message.content)
+                if record.missing or len(message.attachments) < 2:
                     warning_msg = await message.channel.send(
                         f"{message.author.mention}, the format of your message is incorrect. Please use the following format:\n"
                         "```Username: @User\n"
@@ -56,16 +71,15 @@ class Events(commands.Cog):
                     await asyncio.sleep(20)
                     await message.delete()
                     await warning_msg.delete()
+                else:
+                    parsed_logs.put(message, record)
             else:
-                is_company_event = any(
-                    kw in message.channel.name for kw in ["hound-event-logs", "riot-event-logs", "shock-event-logs"]
-                )
+                is_company_event = self._is_company_channel(message.channel)
 
                 point_type = "CEP" if is_company_event else "EP"
-                ep_field = f"{point_type} for event:"
-                required_fields = ["Event:", "Hosted by:", "Attendees:", "Proof:", ep_field]
+                record = parse_event_log(message.content, point_type)
 
-                if any(f not in message.content for f in required_fields):
+                if record.missing:
                     warning_msg = await message.channel.send(
                         f"{message.author.mention}, the format of your message is incorrect. Please use the following format:\n"
                         "```Event: Weekly Meetup\n"
@@ -82,6 +96,34 @@ class Events(commands.Cog):
                     await asyncio.sleep(20)
                     await message.delete()
                     await warning_msg.delete()
+                else:
+                    parsed_logs.put(message, record)
+
+    @commands.Cog.listener()
+    async def on_message_edit(self, before, after):
+        """Re-parse an edited log message so cached records never go stale."""
+        if after.author.bot or after.channel.id not in [ACTIVITY_CHANNEL] + EVENT_LOG_CHANNELS:
+            return
+        if after.channel.id == ACTIVITY_CHANNEL:
+            record = parse_activity_log(after.content)
+            valid = not record.missing and len(after.attachments) >= 2
+        else:
+            point_type = "CEP" if self._is_company_channel(after.channel) else "EP"
+            record = parse_event_log(after.content, point_type)
+            valid = not record.missing
+        if valid:
+            parsed_logs.put(after, record)
+        else:
+            parsed_logs.discard(after.id)
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload):
+        if payload.cached_message is None:
+            parsed_logs.discard(payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload):
+        parsed_logs.discard(payload.message_id)
 
 async def setup(bot):
     await bot.add_cog(Events(bot))
\ No newline at end of file
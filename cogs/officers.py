@@ -1,21 +1,23 @@
-import os
 import discord
-import uuid
 import asyncio
+import tempfile
+from datetime import timedelta
 from discord.ext import commands
 from discord import app_commands
 import re
-import aiohttp
-from config import GUILD_ID, OFFICER_ROLES, STARTER_ROLES
+from config import GUILD_ID, OFFICER_ROLES, STARTER_ROLES, ARCHIVE_SPOOL_MAX_BYTES, EVENT_LOG_CHANNELS, PENDING_SCAN_LIMIT, PENDING_LOOKBACK_DAYS
 from utils.embed_utils import make_embed
 from utils.log_utils import log_command
-from utils.sheets import add_ep, remove_ep, get_ep, find_user_sheet, batch_update_points, add_new_user
-from utils.helpers import format_username
+from utils.sheets import get_ep, get_row_by_username, find_user_sheet, add_new_user
+from utils.helpers import format_username, resolve_usernames
+from utils.parsers import EventLog, ActivityLog, parse_event_log, parse_activity_log, name_from_field, parsed_logs
+from utils.sheets_gateway import sheets_gateway
+from utils.ledger import ledger
+from utils.locks import sheet_locks
+from utils.metrics import metrics
 from discord.colour import Colour
-from dotenv import load_dotenv
 
-load_dotenv()
-EVENT_LOG_WEBHOOK = os.getenv('EVENT_LOG_WEBHOOK')
+PROCESSED_MARKER = "✅"
 
 
 def validate_ep_amount(amount: int) -> discord.Embed | None:
@@ -74,37 +76,184 @@ class Officers(commands.Cog):
             return True
         return commands.check(predicate)
 
-    async def _process_attendees(self, ctx, attendees_line):
-        """Process attendee mentions and return a list of formatted usernames."""
-        attendee_mentions = re.findall(r"<@!?(\d+)>", attendees_line)
-        
-        if not attendee_mentions:
+    async def _resolve_username(self, guild, user_id, resolved=None):
+        """Return the formatted username for a mentioned user ID, raising if they are not a member."""
+        user_id = int(user_id)
+        if resolved is None or user_id not in resolved:
+            resolved = await resolve_usernames(guild, [user_id])
+        if user_id not in resolved:
+            raise commands.CommandError(f"Member <@{user_id}> not found in this server")
+        return resolved[user_id]
+
+    async def _get_log_message(self, ctx, record_type, parse):
+        """
+        Return (message, parsed record) for the message the command replies to.
+        Uses the record `on_message` cached when it is still fresh, then the
+        message Discord resolved with the reply, and only fetches as a last resort.
+        """
+        reference = ctx.message.reference
+        if cached := parsed_logs.get(reference.message_id):
+            message, record = cached
+            if isinstance(record, record_type):
+                return message, record
+        message = reference.resolved if isinstance(reference.resolved, discord.Message) else None
+        if message is None:
+            message = await ctx.channel.fetch_message(reference.message_id)
+        record = parse(message.content)
+        return message, record
+
+    def _claim_event(self, message, kind="event"):
+        """Claim a source message for logging, raising if it was already logged or is being logged."""
+        existing = ledger.claim_event(message.id, message.content)
+        if existing is None:
+            return
+        if existing["status"] == "claimed":
+            raise commands.CommandError(f"This {kind} is already being logged")
+        if existing["same_content"]:
+            raise commands.CommandError(f"This {kind} has already been logged")
+        raise commands.CommandError(f"This {kind} was edited after it was logged - post a new log instead")
+
+    def _is_company_event(self, channel):
+        return any(kw in channel.name for kw in ["hound-event-logs", "riot-event-logs", "shock-event-logs"])
+
+    def _validate_event_log(self, record, attachments):
+        """Raise a CommandError describing the first problem with a parsed event log."""
+        if not attachments:
+            raise commands.CommandError("Proof image required - attach at least one image")
+        if record.missing:
+            raise commands.CommandError(f"Missing fields: {', '.join(record.missing)}")
+        if record.point_value is None or record.point_value > 5:
+            raise commands.CommandError(f"Invalid {record.point_type} value (max 5)")
+        if not record.event:
+            raise commands.CommandError("Missing event information")
+        if not record.host and record.event != "SSU":
+            raise commands.CommandError("Missing host information")
+        if not record.attendee_ids:
             raise commands.CommandError("No valid attendee mentions found")
-        
-        raw_attendees = []
-        for attendee_id in attendee_mentions:
-            member = await ctx.guild.fetch_member(int(attendee_id))
-            raw_attendees.append(format_username(member))
-        
-        return raw_attendees
-
-    async def _process_extra_points(self, ctx, extra_points_line):
-        """Process extra points mentions and return a list of tuples (username, points)."""
-        extra_points_matches = re.findall(r"<@!?(\d+)>\s*\((\d+)\)", extra_points_line)
-        
-        if not extra_points_matches:
+        if record.extra_points and not record.extra_point_ids:
             raise commands.CommandError("No valid extra points mentions found")
-        
+
+    async def _resolve_event_names(self, guild, record):
+        """
+        Resolve the people named in a parsed event log with one batched member lookup.
+        Returns (host, supervisor, co-host, attendee usernames, [(username, extra points)]).
+        """
+        resolved = await resolve_usernames(guild, record.mention_ids())
+
+        async def name_for(value, user_id):
+            if not value:
+                return None
+            if user_id is not None:
+                return await self._resolve_username(guild, user_id, resolved)
+            return name_from_field(value)
+
+        host_name = await name_for(record.host, record.host_id) if record.event != "SSU" else None
+        supervisor_name = await name_for(record.supervisor, record.supervisor_id)
+        cohost_name = await name_for(record.cohost, record.cohost_id)
+        raw_attendees = [await self._resolve_username(guild, user_id, resolved) for user_id in record.attendee_ids]
+
         extra_points = []
-        for user_id, points in extra_points_matches:
-            member = await ctx.guild.fetch_member(int(user_id))
-            username = format_username(member)
-            points = int(points)
+        for user_id, points in record.extra_point_ids:
+            username = await self._resolve_username(guild, user_id, resolved)
             if points > 5:
                 raise commands.CommandError(f"Invalid extra points value for {username} (max 5)")
             extra_points.append((username, points))
-        
-        return extra_points
+
+        return host_name, supervisor_name, cohost_name, raw_attendees, extra_points
+
+    def _build_event_updates(self, record, host_name, supervisor_name, cohost_name, raw_attendees, extra_points, is_company_event):
+        """Build the point updates for a logged event. Looks users up in the sheet mirrors."""
+        point_type = record.point_type
+        ep_value = record.point_value
+
+        def point_update(sheet, username, header, amount):
+            return {
+                "sheet": sheet,
+                "worksheet_name": "Officer Sheet" if sheet == "Officer" else "Main Sheet",
+                "username": username,
+                "header": header,
+                "amount": amount,
+                "is_add": True
+            }
+
+        updates = []
+
+        if record.event != "SSU" and host_name:
+            host_sheet = find_user_sheet(host_name) or "Main"
+            if host_sheet == "Officer":
+                event_columns = {
+                    "Company": "Company Events Hosted",
+                    "Wide": "Events Hosted"
+                }
+                updates.append(point_update("Officer", host_name, "OP", ep_value))
+                updates.append(point_update("Officer", host_name, event_columns["Company" if is_company_event else "Wide"], 1))
+            else:
+                updates.append(point_update("Main", host_name, point_type, ep_value))
+
+            for attendee in raw_attendees:
+                attendee_sheet = find_user_sheet(attendee) or "Main"
+                header = "OP" if attendee_sheet == "Officer" else point_type
+                updates.append(point_update(attendee_sheet, attendee, header, ep_value))
+
+        if supervisor_name:
+            supervisor_sheet = find_user_sheet(supervisor_name) or "Main"
+            updates.append(point_update(supervisor_sheet, supervisor_name, "Supervisor", ep_value))
+
+        if cohost_name:
+            cohost_sheet = find_user_sheet(cohost_name) or "Main"
+            updates.append(point_update(cohost_sheet, cohost_name, "Co-host", ep_value))
+
+        for username, points in extra_points:
+            user_sheet = find_user_sheet(username) or "Main"
+            header = "OP" if user_sheet == "Officer" else point_type
+            updates.append(point_update(user_sheet, username, header, points))
+
+        return updates
+
+    async def _spool_attachment(self, attachment):
+        """
+        Stream an attachment through the bot's HTTP session into a spooled temp
+        file, so only small images are held in memory before re-uploading.
+        """
+        spool = tempfile.SpooledTemporaryFile(max_size=ARCHIVE_SPOOL_MAX_BYTES)
+        try:
+            async with self.bot.http_session.get(attachment.url) as response:
+                response.raise_for_status()
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    spool.write(chunk)
+        except Exception:
+            spool.close()
+            raise
+        spool.seek(0)
+        return discord.File(spool, filename=attachment.filename)
+
+    async def _send_event_archive(self, archive_embed, attachments, event_id):
+        """
+        Send the archive embed and the event's images to the event-log webhook.
+        The event is already logged by then, so failures are only printed.
+        """
+        results = await asyncio.gather(*(
+            self._spool_attachment(attachment)
+            for attachment in attachments
+            if (attachment.content_type or "").startswith('image/')
+        ), return_exceptions=True)
+        files = [result for result in results if isinstance(result, discord.File)]
+        try:
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            if files:
+                archive_embed.set_image(url="attachment://" + files[0].filename)
+            await self.bot.event_log_webhook.send(
+                embed=archive_embed,
+                files=files,
+                username="Event Logger",
+                avatar_url=self.bot.user.display_avatar.url
+            )
+        except Exception as e:
+            print(f"Failed to archive event {event_id}: {e}")
+            for file in files:
+                file.close()
 
     def _format_attendee_list(self, attendees):
         """Format attendees list with truncation."""
@@ -128,191 +277,33 @@ class Officers(commands.Cog):
     @requires_reply()
     async def logevent(self, ctx: commands.Context):
         replied_message = None
+        claimed = False
         try:
-            replied_message = await ctx.channel.fetch_message(ctx.message.reference.message_id)
-            content = replied_message.content
-            
-            if not replied_message.attachments:
-                raise commands.CommandError("Proof image required - attach at least one image")
-            
-            is_company_event = any(
-                kw in ctx.channel.name for kw in ["hound-event-logs", "riot-event-logs", "shock-event-logs"]
-            )
-
+            is_company_event = self._is_company_event(ctx.channel)
             point_type = "CEP" if is_company_event else "EP"
-            ep_field = f"{point_type} for event:"
-            required_fields = ["Event:", "Hosted by:", "Attendees:", "Proof:", ep_field]
-            if missing := [f for f in required_fields if f not in content]:
-                raise commands.CommandError(f"Missing fields: {', '.join(missing)}")
-            
-            ep_pattern = rf"{point_type} for event:\s*(\d+)|{point_type} for Event:\s*(\d+)"
-            ep_match = re.search(ep_pattern, content, re.IGNORECASE)
-
-            if not ep_match or (ep_value := int(ep_match.group(1))) > 5:
-                raise commands.CommandError(f"Invalid {point_type} value (max 5)")
-
-            event_match = re.search(r"Event:\s*(.+)", content)
-            if not event_match:
-                raise commands.CommandError("Missing event information")
-            
-            event_type = event_match.group(1).strip()
-
-            host_match = re.search(r"Hosted by:\s*(.+)", content)
-            if not host_match and event_type != "SSU":
-                raise commands.CommandError("Missing host information")
-            
-            host_name = None
-            if event_type != "SSU":
-                host_content = host_match.group(1)
-                if host_mention := re.search(r"<@!?(\d+)>", host_content):
-                    member = await ctx.guild.fetch_member(int(host_mention.group(1)))
-                    host_name = format_username(member)
-                else:
-                    host_name = host_content.split("|")[1].strip() if "|" in host_content else host_content
-
-            supervisor_match = re.search(r"Supervisor:\s*(.+)", content)
-            supervisor_name = None
-            if supervisor_match:
-                supervisor_content = supervisor_match.group(1)
-                if supervisor_mention := re.search(r"<@!?(\d+)>", supervisor_content):
-                    member = await ctx.guild.fetch_member(int(supervisor_mention.group(1)))
-                    supervisor_name = format_username(member)
-                else:
-                    supervisor_name = supervisor_content.split("|")[1].strip() if "|" in supervisor_content else supervisor_content
-
-            cohost_match = re.search(r"Co-host:\s*(.+)", content)
-            cohost_name = None
-            if cohost_match:
-                cohost_content = cohost_match.group(1)
-                if cohost_mention := re.search(r"<@!?(\d+)>", cohost_content):
-                    member = await ctx.guild.fetch_member(int(cohost_mention.group(1)))
-                    cohost_name = format_username(member)
-                else:
-                    cohost_name = cohost_content.split("|")[1].strip() if "|" in cohost_content else cohost_content
-
-            attendees_match = re.search(r"Attendees:\s*(.*)", content)
-            if not attendees_match:
-                raise commands.CommandError("Missing attendees list")
-            
-            raw_attendees = await self._process_attendees(ctx, attendees_match.group(1))
+            replied_message, record = await self._get_log_message(
+                ctx, EventLog, lambda content: parse_event_log(content, point_type)
+            )
+            if record.point_type != point_type:
+                record = parse_event_log(replied_message.content, point_type)
+            self._validate_event_log(record, replied_message.attachments)
+            self._claim_event(replied_message)
+            claimed = True
+
+            ep_value = record.point_value
+            event_type = record.event
+            host_name, supervisor_name, cohost_name, raw_attendees, extra_points = await self._resolve_event_names(ctx.guild, record)
             attendee_list = self._format_attendee_list(raw_attendees)
 
-            extra_points_match = re.search(r"Extra points:\s*(.*)", content)
-            extra_points = []
-            if extra_points_match:
-                extra_points = await self._process_extra_points(ctx, extra_points_match.group(1))
+            updates = await sheets_gateway.run(
+                self._build_event_updates,
+                record, host_name, supervisor_name, cohost_name, raw_attendees, extra_points, is_company_event
+            )
 
-            updates = []
-            
-            if event_type != "SSU" and host_name:
-                host_sheet = find_user_sheet(host_name) or "Main"
-                if host_sheet == "Officer":
-                    updates.append({
-                        "sheet": "Officer",
-                        "worksheet_name": "Officer Sheet",
-                        "username": host_name,
-                        "header": "OP",
-                        "amount": ep_value,
-                        "is_add": True
-                    })
-                    event_columns = {
-                        "Company": "Company Events Hosted",
-                        "Wide": "Events Hosted"
-                    }
-                    if is_company_event:
-                        updates.append({
-                            "sheet": "Officer",
-                            "worksheet_name": "Officer Sheet",
-                            "username": host_name,
-                            "header": event_columns["Company"],
-                            "amount": 1,
-                            "is_add": True
-                        })
-                    else:
-                        updates.append({
-                            "sheet": "Officer",
-                            "worksheet_name": "Officer Sheet",
-                            "username": host_name,
-                            "header": event_columns["Wide"],
-                            "amount": 1,
-                            "is_add": True
-                        })
-                else:
-                    updates.append({
-                        "sheet": "Main",
-                        "worksheet_name": "Main Sheet",
-                        "username": host_name,
-                        "header": point_type,
-                        "amount": ep_value,
-                        "is_add": True
-                    })
-
-                for attendee in raw_attendees:
-                    attendee_sheet = find_user_sheet(attendee) or "Main"
-                    header = "OP" if attendee_sheet == "Officer" else point_type
-                    updates.append({
-                        "sheet": attendee_sheet,
-                        "worksheet_name": "Officer Sheet" if attendee_sheet == "Officer" else "Main Sheet",
-                        "username": attendee,
-                        "header": header,
-                        "amount": ep_value,
-                        "is_add": True
-                    })
-                else:
-                    updates.append({
-                        "sheet": "Main",
-                        "worksheet_name": "Main Sheet",
-                        "username": attendee,
-                        "header": point_type,
-                        "amount": ep_value,
-                        "is_add": True
-                    })
-
-            if supervisor_name:
-                supervisor_sheet = find_user_sheet(supervisor_name) or "Main"
-                updates.append({
-                    "sheet": supervisor_sheet,
-                    "worksheet_name": "Officer Sheet" if supervisor_sheet == "Officer" else "Main Sheet",
-                    "username": supervisor_name,
-                    "header": "Supervisor",
-                    "amount": ep_value,
-                    "is_add": True
-                })
-
-            if cohost_name:
-                cohost_sheet = find_user_sheet(cohost_name) or "Main"
-                updates.append({
-                    "sheet": cohost_sheet,
-                    "worksheet_name": "Officer Sheet" if cohost_sheet == "Officer" else "Main Sheet",
-                    "username": cohost_name,
-                    "header": "Co-host",
-                    "amount": ep_value,
-                    "is_add": True
-                })
-
-            for username, points in extra_points:
-                user_sheet = find_user_sheet(username) or "Main"
-                if user_sheet == "Officer":
-                    updates.append({
-                        "sheet": "Officer",
-                        "worksheet_name": "Officer Sheet",
-                        "username": username,
-                        "header": "OP",
-                        "amount": points,
-                        "is_add": True
-                    })
-                else:
-                    updates.append({
-                        "sheet": "Main",
-                        "worksheet_name": "Main Sheet",
-                        "username": username,
-                        "header": point_type,
-                        "amount": points,
-                        "is_add": True
-                    })
-
-            batch_update_points(updates)
-            event_id = str(uuid.uuid4())
+            ledger.append(updates, [replied_message.id])
+            claimed = False
+            await replied_message.add_reaction(PROCESSED_MARKER)
+            event_id = str(replied_message.id)
             embed_color = Colour.red() if is_company_event else Colour.green()
             embed = make_embed(
                 type="Success",
@@ -329,14 +320,7 @@ class Officers(commands.Cog):
             )
             success_msg = await ctx.send(embed=embed)
 
-            async with aiohttp.ClientSession() as session:
-                webhook = discord.Webhook.from_url(EVENT_LOG_WEBHOOK, session=session)
-                files = []
-                
-                for attachment in replied_message.attachments:
-                    if attachment.content_type.startswith('image/'):
-                        files.append(await attachment.to_file())
-                
+            if self.bot.event_log_webhook:
                 archive_embed = make_embed(
                     type="Info",
                     title=f"{'Company ' if is_company_event else ''}Event Archive: {event_type}",
@@ -352,16 +336,8 @@ class Officers(commands.Cog):
                 )
                 archive_embed.colour = embed_color
                 archive_embed.set_footer(text=f"Event ID: {event_id}", icon_url="https://cdn.discordapp.com/emojis/1155991227032936448.webp?size=128")
-                if files:
-                    archive_embed.set_image(url="attachment://" + files[0].filename)
-
-                await webhook.send(
-                    embed=archive_embed,
-                    files=files,
-                    username="Event Logger",
-                    avatar_url=self.bot.user.display_avatar.url
-                )
-            
+                await self._send_event_archive(archive_embed, replied_message.attachments, event_id)
+
             await log_command(
                 bot=self.bot,
                 command_name="logevent",
@@ -380,6 +356,8 @@ class Officers(commands.Cog):
                 Attendees=len(raw_attendees)
             )
         except Exception as e:
+            if claimed:
+                ledger.release_event(replied_message.id)
             embed = make_embed(
                 type="Error",
                 title="Logging Failed",
@@ -401,42 +379,186 @@ class Officers(commands.Cog):
 
         self.bot.loop.create_task(delete_messages_after_delay(self.bot, [ctx.message, replied_message, success_msg], 5))
 
+    def _parse_pending_event(self, message, point_type):
+        """Return the cached event record for a message, re-parsing it when absent or stale."""
+        cached = parsed_logs.get(message.id)
+        record = cached[1] if cached and isinstance(cached[1], EventLog) else None
+        if record is None or record.point_type != point_type:
+            record = parse_event_log(message.content, point_type)
+        return record
+
+    async def _prepare_pending_event(self, message, record):
+        """Validate and resolve one pending event log. Returns (record, resolved names)."""
+        self._validate_event_log(record, message.attachments)
+        return record, await self._resolve_event_names(message.guild, record)
+
+    def _build_pending_updates(self, prepared, is_company_event):
+        """Build the point updates of several prepared events in one worker-pool hop."""
+        return [
+            self._build_event_updates(record, *names, is_company_event)
+            for record, names in prepared
+        ]
+
+    async def _log_pending_batch(self, ctx, candidates, is_company_event):
+        """
+        Log the unprocessed event messages among `candidates`.
+        Returns ({message id: status line}, logged count, already-logged count).
+        """
+        point_type = "CEP" if is_company_event else "EP"
+        already_logged = {
+            message.id for message in candidates
+            if any(str(reaction.emoji) == PROCESSED_MARKER and reaction.me for reaction in message.reactions)
+        }
+        pending = [message for message in candidates if message.id not in already_logged]
+
+        records = [self._parse_pending_event(message, point_type) for message in pending]
+        await resolve_usernames(ctx.guild, [user_id for record in records for user_id in record.mention_ids()])
+        results = await asyncio.gather(
+            *(self._prepare_pending_event(message, record) for message, record in zip(pending, records)),
+            return_exceptions=True
+        )
+
+        prepared = []
+        statuses = {}
+        for message, result in zip(pending, results):
+            if isinstance(result, Exception):
+                statuses[message.id] = f"❌ [{message.author.display_name}]({message.jump_url}): {result}"
+                continue
+            existing = ledger.claim_event(message.id, message.content)
+            if existing is None:
+                prepared.append((message, result))
+            elif existing["status"] == "logged" and existing["same_content"]:
+                already_logged.add(message.id)
+            else:
+                statuses[message.id] = f"❌ [{message.author.display_name}]({message.jump_url}): already logged or in progress"
+
+        if prepared:
+            message_ids = [message.id for message, _ in prepared]
+            try:
+                update_lists = await sheets_gateway.run(
+                    self._build_pending_updates, [result for _, result in prepared], is_company_event
+                )
+            except Exception:
+                for message_id in message_ids:
+                    ledger.release_event(message_id)
+                raise
+            ledger.append([upd for updates in update_lists for upd in updates], message_ids)
+            try:
+                await ledger.flush(sheets_gateway)
+            except Exception as e:
+                print(f"Ledger flush after logpending failed, deltas stay pending: {e}")
+            await asyncio.gather(
+                *(message.add_reaction(PROCESSED_MARKER) for message, _ in prepared),
+                return_exceptions=True
+            )
+            for (message, (record, names)), updates in zip(prepared, update_lists):
+                statuses[message.id] = (
+                    f"✅ [{record.event}]({message.jump_url}): {len(names[3])} attendees, "
+                    f"{record.point_value} {point_type}, {len(updates)} updates"
+                )
+        return statuses, len(prepared), len(already_logged)
+
+    @commands.hybrid_command(name="logpending", description="Log every pending event in this channel")
+    @app_commands.guilds(discord.Object(id=GUILD_ID))
+    @is_officer()
+    async def logpending(self, ctx: commands.Context):
+        """
+        Log every unprocessed event message in this event-log channel since the
+        last checkpoint (or the last PENDING_LOOKBACK_DAYS days on the first run).
+        History is read PENDING_SCAN_LIMIT messages at a time until caught up;
+        each batch's events are parsed and resolved concurrently, their points
+        are written in one batch, and each logged message is marked with
+        PROCESSED_MARKER; each message is claimed in the ledger first so it is never
+        counted twice. Messages that fail to log are reported and skipped, so the
+        checkpoint always moves past a scanned batch.
+        """
+        if ctx.channel.id not in EVENT_LOG_CHANNELS:
+            return await ctx.send(embed=make_embed(
+                type="Error",
+                title="Wrong Channel",
+                description="This command can only be used in an event-log channel."
+            ))
+        if ctx.interaction:
+            await ctx.defer()
+
+        checkpoint_name = f"pending:{ctx.channel.id}"
+        checkpoint = ledger.get_checkpoint(checkpoint_name)
+        if checkpoint is None:
+            checkpoint = discord.utils.time_snowflake(discord.utils.utcnow() - timedelta(days=PENDING_LOOKBACK_DAYS))
+        is_company_event = self._is_company_event(ctx.channel)
+
+        lines = []
+        logged = skipped = 0
+        while True:
+            batch = [
+                message async for message in ctx.channel.history(
+                    limit=PENDING_SCAN_LIMIT, after=discord.Object(id=checkpoint), oldest_first=True
+                )
+            ]
+            if not batch:
+                break
+            candidates = [message for message in batch if not message.author.bot and not message.content.startswith("-")]
+            statuses, batch_logged, batch_skipped = await self._log_pending_batch(ctx, candidates, is_company_event)
+            lines += [statuses[message.id] for message in candidates if message.id in statuses]
+            logged += batch_logged
+            skipped += batch_skipped
+            checkpoint = batch[-1].id
+            ledger.set_checkpoint(checkpoint_name, checkpoint)
+            if len(batch) < PENDING_SCAN_LIMIT:
+                break
+
+        description = "\n".join(lines) if lines else "No pending events found."
+        if len(description) > 4000:
+            description = description[:3990] + "\n..."
+        embed = make_embed(
+            type="Success" if logged == len(lines) else "Warn",
+            title=f"Pending Events Logged ({logged}/{len(lines)})",
+            description=description
+        )
+        await ctx.send(embed=embed)
+
+        await log_command(
+            bot=self.bot,
+            command_name="logpending",
+            user=ctx.author,
+            guild=ctx.guild,
+            Parameters=f"Channel: {ctx.channel.name} | Logged: {logged} | Failed: {len(lines) - logged} | Skipped: {skipped}",
+        )
+
     @commands.hybrid_command(name="logtime", description="Log time from a formatted message")
     @app_commands.guilds(discord.Object(id=GUILD_ID))
     @is_officer()
     @requires_reply()
     async def logtime(self, ctx: commands.Context):
         replied_message = None
+        claimed = False
         try:
-            replied_message = await ctx.channel.fetch_message(ctx.message.reference.message_id)
-            content = replied_message.content
+            replied_message, record = await self._get_log_message(ctx, ActivityLog, parse_activity_log)
 
             if len(replied_message.attachments) < 2:
                 raise commands.CommandError("At least two proof images are required")
 
             required_fields = ["Username:", "Time Started:", "Time Ended:", "Time logged:"]
-            if missing := [f for f in required_fields if f not in content]:
+            if missing := [f for f in required_fields if f in record.missing]:
                 raise commands.CommandError(f"Missing fields: {', '.join(missing)}")
 
-            username_match = re.search(r"Username:\s*(<@!?(\d+)>|\S+)", content)
-            if not username_match:
+            if not record.username:
                 raise commands.CommandError("Invalid or missing username")
             
-            user_id = username_match.group(2)
-            if user_id:
-                member = await ctx.guild.fetch_member(int(user_id))
-                username = format_username(member)
+            if record.username_id:
+                username = await self._resolve_username(ctx.guild, record.username_id)
             else:
-                username = username_match.group(1)
+                username = record.username
 
-            time_logged_match = re.search(r"Time logged:\s*(\d+)", content)
-            if not time_logged_match:
+            if record.time_logged is None:
                 raise commands.CommandError("Invalid or missing time logged")
             
-            time_logged = int(time_logged_match.group(1))
+            time_logged = record.time_logged
+            self._claim_event(replied_message, "time log")
+            claimed = True
 
             updates = [{
-                "sheet": find_user_sheet(username) or "Main",
+                "sheet": await sheets_gateway.run(find_user_sheet, username) or "Main",
                 "worksheet_name": "Main Sheet",
                 "username": username,
                 "header": "In-game Time",
@@ -444,7 +566,8 @@ class Officers(commands.Cog):
                 "is_add": True
             }]
 
-            batch_update_points(updates)
+            ledger.append(updates, [replied_message.id])
+            claimed = False
 
             embed = make_embed(
                 type="Success",
@@ -466,6 +589,8 @@ class Officers(commands.Cog):
                 Time_Logged=time_logged
             )
         except Exception as e:
+            if claimed:
+                ledger.release_event(replied_message.id)
             embed = make_embed(
                 type="Error",
                 title="Logging Failed",
@@ -512,7 +637,9 @@ class Officers(commands.Cog):
             roles = [ctx.guild.get_role(role_id) for role_id in STARTER_ROLES]
             await member.add_roles(*roles, reason="Assigned starter roles")
             print(f"Assigned roles to {member.name}: {[role.name for role in roles]}")
-            add_new_user("Main", roblox_username)
+            async with sheet_locks.hold("Main"):
+                if await sheets_gateway.run(get_row_by_username, "Main", roblox_username) is None:
+                    await sheets_gateway.run(add_new_user, "Main", roblox_username)
 
             from config import STARTER_CHANNELS, WELCOME_CHANNEL
             for channel_id in STARTER_CHANNELS:
@@ -564,18 +691,90 @@ class Officers(commands.Cog):
 
         self.bot.loop.create_task(delete_messages_after_delay(self.bot, [ctx.message, replied_message, success_msg], 5))
 
+    @commands.hybrid_command(name="stats", description="Show per-command latency, API calls and cache hit rates")
+    @app_commands.guilds(discord.Object(id=GUILD_ID))
+    @is_officer()
+    async def stats(self, ctx: commands.Context):
+        """Show the bot's instrumentation: per-command timings and calls, then component counters."""
+        snapshot = metrics.snapshot()
+
+        def ms(value):
+            return "-" if value is None else f"≤{value:g}ms"
+
+        lines = []
+        for name, entry in sorted(snapshot["commands"].items(), key=lambda item: -item[1]["count"]):
+            runs = entry["count"] or 1
+            lines.append(
+                f"**{name}** ×{entry['count']} ({entry['errors']} failed) · p50 {ms(entry['latency_ms_p50'])} · "
+                f"p95 {ms(entry['latency_ms_p95'])}\n"
+                f"Sheets {entry['sheets_calls'] / runs:.1f}/run · Discord {entry['discord_calls'] / runs:.1f}/run · "
+                f"{(entry['sheets_bytes_sent'] + entry['sheets_bytes_received']) / 1024:.1f} KiB · {entry['retries']} retries"
+            )
+        description = "\n".join(lines) if lines else "No commands recorded yet."
+        if len(description) > 4000:
+            description = description[:3990] + "\n..."
+
+        def hit_rate(stats):
+            lookups = stats.get("hits", 0) + stats.get("misses", 0)
+            return f"{stats['hits'] / lookups:.0%} of {lookups}" if lookups else "-"
+
+        components = snapshot["components"]
+        fields = []
+        caches = [(name, stats) for name, stats in components.items() if "hits" in stats]
+        if caches:
+            fields.append(("Cache hit rates", "\n".join(f"{name}: {hit_rate(stats)}" for name, stats in caches), False))
+        if gateway := components.get("sheets_gateway"):
+            fields.append(("Sheets gateway", (
+                f"{gateway['completed']} done · {gateway['failed']} failed · {gateway['retries']} retries\n"
+                f"wait {gateway['avg_wait_ms']}ms · run {gateway['avg_run_ms']}ms · max queue {gateway['max_queue_depth']}"
+            ), False))
+        if quota := components.get("sheets_quota"):
+            fields.append(("Sheets quota (this minute)", (
+                f"reads {quota['read_remaining']}/{quota['read_quota']} left · "
+                f"writes {quota['write_remaining']}/{quota['write_quota']} left\n"
+                f"{quota['deferred']} deferred · {quota['warnings']} warnings"
+            ), False))
+        if ledger_stats := components.get("ledger"):
+            fields.append(("Ledger", f"{ledger_stats['pending']} pending · {ledger_stats['flushes']} flushes", True))
+        if locks := components.get("sheet_locks"):
+            fields.append(("Sheet locks", f"{locks['contended']}/{locks['acquisitions']} contended · max wait {locks['max_wait_ms']}ms", True))
+
+        embed = make_embed(
+            type="Information",
+            title=f"Bot Stats (up {snapshot['uptime_s'] // 3600}h {snapshot['uptime_s'] % 3600 // 60}m)",
+            description=description,
+            fields=fields,
+        )
+        await ctx.send(embed=embed, ephemeral=True)
+
 class EP(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def _current_ep(self, username):
+        """Return a user's EP including deltas that are still waiting in the ledger."""
+        async with sheet_locks.hold("Main"):
+            ep_value = await sheets_gateway.run(get_ep, username)
+            if ep_value is None:
+                return None
+            return max(0, ep_value + ledger.pending_delta(username, "EP"))
+
     async def _ep_command_wrapper(self, ctx, member, amount, command_type):
         """Wrapper for EP commands handling common logic."""
         if (embed := validate_ep_amount(amount)):
             return await ctx.send(embed=embed), False
         
         username = format_username(member)
-        command_handler = add_ep if command_type == "add" else remove_ep
-        success = command_handler(username, amount)
+        success = await sheets_gateway.run(get_row_by_username, "Main", username) is not None
+        if success:
+            ledger.append([{
+                "sheet": "Main",
+                "worksheet_name": "Main Sheet",
+                "username": username,
+                "header": "EP",
+                "amount": amount,
+                "is_add": command_type == "add"
+            }])
         
         if success:
             await log_command(
@@ -629,7 +828,7 @@ class EP(commands.Cog):
                     title="EP Removed",
                     description=f"{amount} EP removed from {member.mention}"
                 )
-                embed.add_field(name="New EP Total", value=f"{get_ep(format_username(member))}", inline=True)
+                embed.add_field(name="New EP Total", value=f"{await self._current_ep(format_username(member))}", inline=True)
                 message = await ctx.send(embed=embed)
                 await delete_messages_after_delay(ctx.bot, [ctx.message, message], 5)
             else:
@@ -645,7 +844,7 @@ class EP(commands.Cog):
     @app_commands.guilds(discord.Object(id=GUILD_ID))
     async def ep_view(self, ctx, member: discord.Member):
             username = format_username(member)
-            ep_value = get_ep(username)
+            ep_value = await self._current_ep(username)
             if ep_value is not None:
                 embed = make_embed(
                     type="Success",
@@ -3,33 +3,39 @@ from discord.ext import commands
 from discord import app_commands
 from config import GUILD_ID
 from utils.embed_utils import make_embed
-from utils.sheets import get_row_by_username, get_cell_color, client, sheets, add_cep, add_new_user
+from utils.sheets import get_row_by_username, get_quota_row, add_new_user
+from utils.color_snapshot import QUOTA_PASSED, QUOTA_FAILED, QUOTA_EXCUSED
 from utils.log_utils import log_command
 from utils.helpers import format_username
+from utils.sheets_gateway import sheets_gateway
+from utils.rate_limit import retry_policy
+from utils.leaderboard import leaderboard_cache
 
 class Utilities(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         
-    def _get_quota_data(self, username, row_index):
-        """Retrieve quota data for a user from the Google Sheet."""
+    def _get_quota_data(self, username):
+        """Retrieve quota values and colour statuses for a user from the cached Main Sheet snapshot."""
         try:
-            spreadsheet = client.open_by_key(sheets["Main"])
-            worksheet = spreadsheet.worksheet("Main Sheet")
-            row_values = worksheet.row_values(row_index)
+            cells = get_quota_row(username)
+            if cells is None:
+                return None
 
             def get_status(column_index):
-                value = row_values[column_index - 1] if len(row_values) >= column_index else "N/A"
-                color = get_cell_color("Main", username, column_index)
-                status = "✅" if color == "#b7e1cd" else "❌"
-                return value, status
+                value, code = cells[column_index - 4]
+                status = "✅" if code == QUOTA_PASSED else "❌"
+                return value if value is not None else "N/A", status
 
             return {
+                "row_status": cells[0][1],
                 "EP": get_status(5),
                 "CEP": get_status(6),
                 "IGT": get_status(7)
             }
         except Exception as e:
+            if retry_policy.is_retryable(e):
+                raise
             print(f"Error fetching quota data: {e}")
             return None
 
@@ -93,7 +99,7 @@ class Utilities(commands.Cog):
         
         loading_message = await self._send_loading(ctx)
         
-        user_row_index = get_row_by_username("Main", username)
+        user_row_index = await sheets_gateway.run(get_row_by_username, "Main", username)
         if not user_row_index:
             return await self._send_response(
                 ctx, 
@@ -102,10 +108,7 @@ class Utilities(commands.Cog):
                 loading_message
             )
 
-        user_row_color = get_cell_color("Main", username, 4)
-        excused, failed = user_row_color == "#351c75", user_row_color == "#ff0000"
-
-        quota_data = self._get_quota_data(username, user_row_index)
+        quota_data = await sheets_gateway.run(self._get_quota_data, username)
         if not quota_data:
             return await self._send_response(
                 ctx, 
@@ -114,6 +117,9 @@ class Utilities(commands.Cog):
                 loading_message
             )
 
+        user_row_status = quota_data["row_status"]
+        excused, failed = user_row_status == QUOTA_EXCUSED, user_row_status == QUOTA_FAILED
+
         ep_value, ep_status = quota_data["EP"]
         cep_value, cep_status = quota_data["CEP"]
         igt_value, igt_status = quota_data["IGT"]
@@ -142,34 +148,18 @@ class Utilities(commands.Cog):
 
 
 
-    @commands.hybrid_command(name="leaderboard", description="Show the top 10 users in the leaderboard")
+    @commands.hybrid_command(name="leaderboard", description="Show the top users by Total EP, 10 per page")
     @app_commands.guilds(discord.Object(id=GUILD_ID))
-    async def leaderboard(self, ctx: commands.Context):
-        """Retrieve and display the top 10 users from the leaderboard."""
+    @commands.cooldown(1, 5, commands.BucketType.user)
+    async def leaderboard(self, ctx: commands.Context, page: int = 1):
+        """Display a page of the cached, pre-rendered leaderboard."""
         try:
-            spreadsheet = client.open_by_key(sheets["Leaderboard"])
-            worksheet = spreadsheet.worksheet("Leaderboard")
-            rows = worksheet.get_all_values()[5:15]
+            if leaderboard_cache.is_stale():
+                await sheets_gateway.run(leaderboard_cache.refresh)
 
-            if not rows:
+            embed = leaderboard_cache.page(page)
+            if embed is None:
                 raise commands.CommandError("No data found in the leaderboard.")
-
-            embed = make_embed(
-                type="Info",
-                title="🏆 Leaderboard",
-                description="Here are the top 10 users in the leaderboard:"
-            )
-
-            medals = ["🥇", "🥈", "🥉"]
-            for i, row in enumerate(rows):
-                position, username, points = row
-                medal = medals[i] if i < 3 else ""
-                embed.add_field(
-                    name=f"{medal} {position}. {username}",
-                    value=f"Event Points: {points}",
-                    inline=False
-                )
-            embed.color = discord.Color.yellow()
             await ctx.send(embed=embed)
 
         except Exception as e:
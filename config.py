@@ -8,4 +8,37 @@ STARTER_CHANNELS = [1272010843495727125, 1324764708108238868, 126967669663884911
 WELCOME_CHANNEL = 1269671420296691731
 
 ACTIVITY_CHANNEL = 1324749254614319104
-EVENT_LOG_CHANNELS = [1269671419831128173, 1348371148228005968, 1349758808607428799, 1348330485494845551]
\ No newline at end of file
+EVENT_LOG_CHANNELS = [1269671419831128173, 1348371148228005968, 1349758808607428799, 1348330485494845551]
+
+SHEETS_MAX_WORKERS = 4
+SHEET_MIRROR_TTL = 1800
+SHEET_MIRROR_MISS_REFRESH = 60
+SHEETS_REQUESTS_PER_MINUTE = 60
+SHEETS_MAX_ATTEMPTS = 5
+SHEETS_BACKOFF_BASE = 1
+SHEETS_BACKOFF_CAP = 32
+SHEETS_RETRY_BUDGET_PER_MINUTE = 20
+SHEETS_READ_QUOTA_PER_MINUTE = 60
+SHEETS_WRITE_QUOTA_PER_MINUTE = 60
+SHEETS_QUOTA_LOW_WATERMARK = 0.25
+SHEETS_QUOTA_WARN_COOLDOWN = 300
+LEDGER_PATH = "ledger.db"
+LEDGER_FLUSH_INTERVAL = 10
+QUOTA_SNAPSHOT_TTL = 600
+LOG_BATCH_WINDOW = 1.0
+LOG_CHANNEL_MIN_INTERVAL = 1.0
+ARCHIVE_SPOOL_MAX_BYTES = 1024 * 1024
+PARSE_CACHE_SIZE = 512
+PARSE_CACHE_TTL = 3600
+PENDING_SCAN_LIMIT = 100
+PENDING_LOOKBACK_DAYS = 14
+PROCESSED_CLAIM_TTL = 300
+LOCAL_STORE_ENABLED = False
+STORE_SYNC_INTERVAL = 60
+LEADERBOARD_HEADER = "Total EP"
+LEADERBOARD_PAGE_SIZE = 10
+LEADERBOARD_MAX_ENTRIES = 50
+LEADERBOARD_REFRESH_INTERVAL = 120
+MIRROR_POLL_INTERVAL = 30
+METRICS_FILE = "metrics.prom"
+METRICS_EXPORT_INTERVAL = 15
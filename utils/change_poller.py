@@ -0,0 +1,24 @@
+import asyncio
+from config import MIRROR_POLL_INTERVAL
+from utils.leaderboard import leaderboard_cache
+from utils.locks import sheet_locks
+from utils.rate_limit import quota_accountant
+from utils.sheets import mirrors, poll_mirror_changes
+
+async def run_change_poller(gateway, interval: float = MIRROR_POLL_INTERVAL):
+    """
+    Poll the sheets for hand edits every `interval` seconds until cancelled.
+    Holds every mirrored sheet's lock so the bot's own writes never look like edits.
+    Polls are skipped while the read budget is low.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        if not quota_accountant.allow_low_priority("read"):
+            continue
+        try:
+            async with sheet_locks.hold(*mirrors):
+                changes = await gateway.run(poll_mirror_changes)
+            if changes.get("Main"):
+                leaderboard_cache.invalidate()
+        except Exception as e:
+            print(f"Sheet change poll failed, will retry: {e}")
@@ -0,0 +1,83 @@
+import threading
+import time
+from array import array
+
+QUOTA_NONE = 0
+QUOTA_PASSED = 1
+QUOTA_FAILED = 2
+QUOTA_EXCUSED = 3
+QUOTA_OTHER = 4
+
+QUOTA_COLORS = {
+    "#b7e1cd": QUOTA_PASSED,
+    "#ff0000": QUOTA_FAILED,
+    "#351c75": QUOTA_EXCUSED,
+}
+
+class ColorSnapshot:
+    """
+    Background-colour status of a block of columns, one small-int code per row
+    per column (see the `QUOTA_*` constants), loaded from a single grid-data read.
+
+    :param worksheet_name: Title of the worksheet the columns belong to.
+    :param first_col: First 1-indexed column in the snapshot.
+    :param last_col: Last 1-indexed column in the snapshot.
+    :param ttl: Seconds after which the snapshot should be reloaded.
+    """
+
+    def __init__(self, worksheet_name: str, first_col: int, last_col: int, ttl: float):
+        self.worksheet_name = worksheet_name
+        self.first_col = first_col
+        self.last_col = last_col
+        self.ttl = ttl
+        self.codes: dict[int, array] = {}
+        self.loaded_at = None
+        self.loads = 0
+        self._lock = threading.Lock()
+
+    def is_stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.ttl
+
+    def invalidate(self):
+        with self._lock:
+            self.loaded_at = None
+
+    def load(self, row_data: list[dict], to_hex):
+        """
+        Replace the snapshot with `rowData` from a `spreadsheets.get` grid-data
+        response that starts at row 1 and `first_col`. `to_hex` turns an API
+        colour dict into a hex string.
+        """
+        width = self.last_col - self.first_col + 1
+        codes = {col: array("B", bytes(len(row_data))) for col in range(self.first_col, self.last_col + 1)}
+        for row_offset, row in enumerate(row_data):
+            values = row.get("values", [])
+            for col_offset in range(min(width, len(values))):
+                bg_color = values[col_offset].get("effectiveFormat", {}).get("backgroundColor")
+                if bg_color:
+                    code = QUOTA_COLORS.get(to_hex(bg_color), QUOTA_OTHER)
+                    codes[self.first_col + col_offset][row_offset] = code
+        with self._lock:
+            self.codes = codes
+            self.loaded_at = time.monotonic()
+            self.loads += 1
+
+    def status(self, row_index: int, col_index: int) -> int:
+        """Return the status code of a cell, or QUOTA_NONE if it is outside the snapshot."""
+        with self._lock:
+            column = self.codes.get(col_index)
+            if column is None or not 0 < row_index <= len(column):
+                return QUOTA_NONE
+            return column[row_index - 1]
+
+    def column(self, col_index: int) -> array:
+        """Return a copy of the status codes of a whole column, indexed by row - 1."""
+        with self._lock:
+            return array("B", self.codes.get(col_index, array("B")))
+
+    def stats(self) -> dict:
+        return {
+            "rows": len(next(iter(self.codes.values()), ())),
+            "loads": self.loads,
+            "stale": self.is_stale(),
+        }
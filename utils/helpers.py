@@ -1,12 +1,73 @@
+import asyncio
 import discord
 from utils.embed_utils import make_embed
 
+QUERY_MEMBERS_CHUNK = 100
+
+_username_cache: dict[int, str] = {}
+username_cache_stats = {"hits": 0, "misses": 0}
+
 def format_username(member: discord.Member) -> str:
     """Extract formatted username from member's nickname or name."""
     nick_or_name = member.nick or member.name
     nick_parts = [part.strip() for part in nick_or_name.split("|")]
     return nick_parts[1] if len(nick_parts) > 1 else nick_or_name
 
+def forget_username(user_id: int):
+    """Drop a memoized username, e.g. after the member changed their nickname."""
+    _username_cache.pop(user_id, None)
+
+async def _fetch_member_or_none(guild: discord.Guild, user_id: int) -> discord.Member | None:
+    try:
+        return await guild.fetch_member(user_id)
+    except discord.NotFound:
+        return None
+
+async def resolve_usernames(guild: discord.Guild, user_ids) -> dict[int, str]:
+    """
+    Resolve user IDs to formatted usernames.
+
+    Memoized names are used first, then the gateway member cache, then one
+    `query_members` request per 100 missing IDs (run concurrently), and finally
+    concurrent `fetch_member` calls for anything still missing.
+    IDs that are not members of the guild are left out of the result.
+    """
+    user_ids = list(dict.fromkeys(int(user_id) for user_id in user_ids))
+    resolved = {}
+    missing = []
+    for user_id in user_ids:
+        if user_id in _username_cache:
+            username_cache_stats["hits"] += 1
+            resolved[user_id] = _username_cache[user_id]
+            continue
+        username_cache_stats["misses"] += 1
+        if member := guild.get_member(user_id):
+            resolved[user_id] = _username_cache[user_id] = format_username(member)
+        else:
+            missing.append(user_id)
+
+    if missing:
+        chunks = [missing[i:i + QUERY_MEMBERS_CHUNK] for i in range(0, len(missing), QUERY_MEMBERS_CHUNK)]
+        results = await asyncio.gather(
+            *(guild.query_members(user_ids=chunk, limit=len(chunk)) for chunk in chunks),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                print(f"Member query failed, falling back to fetch_member: {result}")
+                continue
+            for member in result:
+                resolved[member.id] = _username_cache[member.id] = format_username(member)
+
+    still_missing = [user_id for user_id in missing if user_id not in resolved]
+    if still_missing:
+        members = await asyncio.gather(*(_fetch_member_or_none(guild, user_id) for user_id in still_missing))
+        for member in members:
+            if member is not None:
+                resolved[member.id] = _username_cache[member.id] = format_username(member)
+
+    return resolved
+
 def validate_ep_amount(amount: int) -> discord.Embed | None:
     """Validate EP amount and return error embed if invalid."""
     if amount > 5:
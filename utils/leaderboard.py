@@ -0,0 +1,142 @@
+import asyncio
+import heapq
+import threading
+import time
+import discord
+from config import LEADERBOARD_HEADER, LEADERBOARD_PAGE_SIZE, LEADERBOARD_MAX_ENTRIES, LEADERBOARD_REFRESH_INTERVAL, LOCAL_STORE_ENABLED
+from utils.embed_utils import make_embed
+from utils.rate_limit import quota_accountant
+from utils.sheets import USERNAME_COLUMN, get_mirror, mirrors
+from utils.store import point_store
+
+MEDALS = ["🥇", "🥈", "🥉"]
+
+def _points(value) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def rank_mirrored_totals(header: str, limit: int) -> list[tuple[str, int]]:
+    """Return the `limit` highest (username, points) pairs for `header` in the Main Sheet mirror."""
+    totals = (
+        (username, points)
+        for username, record_header, value in get_mirror("Main").records(USERNAME_COLUMN)
+        if record_header == header and (points := _points(value)) is not None
+    )
+    return heapq.nlargest(limit, totals, key=lambda entry: entry[1])
+
+class LeaderboardCache:
+    """
+    Ranked leaderboard entries with their embeds rendered once per page.
+
+    Entries are ranked with a heap over the Main Sheet mirror, or read from the
+    local store when it is enabled, so a refresh sends no Sheets request unless
+    the mirror itself is stale. Pages are rendered on first use after each
+    refresh and then served as is until the cache is invalidated (after point
+    writes and detected hand edits) or older than `ttl` seconds.
+
+    :param header: Main Sheet column the leaderboard ranks by.
+    :param page_size: Entries per page (at most 25, Discord's field limit).
+    :param max_entries: Entries kept across all pages.
+    :param ttl: Seconds after which the entries are refreshed.
+    """
+
+    def __init__(self, header: str, page_size: int, max_entries: int, ttl: float):
+        self.header = header
+        self.page_size = page_size
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: list[tuple[str, int]] = []
+        self.built_at = None
+        self.builds = 0
+        self.hits = 0
+        self.misses = 0
+        self._pages: dict[int, discord.Embed] = {}
+        self._lock = threading.Lock()
+
+    def is_stale(self) -> bool:
+        return self.built_at is None or time.monotonic() - self.built_at > self.ttl
+
+    def invalidate(self):
+        with self._lock:
+            self.built_at = None
+
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-len(self.entries) // self.page_size))
+
+    def refresh(self):
+        """
+        Re-rank the entries (blocking; run it through the Sheets gateway). A
+        stale mirror is only reloaded for this when the read budget allows it,
+        otherwise the previous entries keep being served.
+        """
+        if LOCAL_STORE_ENABLED and point_store.is_loaded("Main"):
+            entries = point_store.top("Main", self.header, self.max_entries)
+        elif self.entries and mirrors["Main"].is_stale() and not quota_accountant.allow_low_priority("read"):
+            return
+        else:
+            entries = rank_mirrored_totals(self.header, self.max_entries)
+        with self._lock:
+            self.entries = entries
+            self._pages = {}
+            self.built_at = time.monotonic()
+            self.builds += 1
+
+    def _render(self, page: int) -> discord.Embed:
+        first = (page - 1) * self.page_size
+        entries = self.entries[first:first + self.page_size]
+        embed = make_embed(
+            type="Info",
+            title="🏆 Leaderboard",
+            description=(
+                f"Here are the top {len(entries)} users in the leaderboard:" if page == 1
+                else f"Here are users {first + 1}–{first + len(entries)} of the leaderboard:"
+            )
+        )
+        for position, (username, points) in enumerate(entries, start=first + 1):
+            medal = MEDALS[position - 1] if position <= len(MEDALS) else ""
+            embed.add_field(
+                name=f"{medal} {position}. {username}",
+                value=f"{self.header}: {points}",
+                inline=False
+            )
+        embed.set_footer(text=f"Page {page}/{self.page_count}")
+        embed.color = discord.Color.yellow()
+        return embed
+
+    def page(self, page: int) -> discord.Embed | None:
+        """Return the rendered embed of a 1-indexed page, or None if there are no entries."""
+        with self._lock:
+            if not self.entries:
+                return None
+            page = min(max(1, page), self.page_count)
+            embed = self._pages.get(page)
+            if embed is None:
+                self.misses += 1
+                embed = self._pages[page] = self._render(page)
+            else:
+                self.hits += 1
+            return embed
+
+    async def run_refresher(self, gateway, interval: float = LEADERBOARD_REFRESH_INTERVAL):
+        """Refresh the entries whenever they are stale, checking every `interval` seconds until cancelled."""
+        while True:
+            if self.is_stale():
+                try:
+                    await gateway.run(self.refresh)
+                except Exception as e:
+                    print(f"Leaderboard refresh failed, serving the previous ranking: {e}")
+            await asyncio.sleep(interval)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self.entries),
+            "pages": self.page_count,
+            "builds": self.builds,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+leaderboard_cache = LeaderboardCache(LEADERBOARD_HEADER, LEADERBOARD_PAGE_SIZE, LEADERBOARD_MAX_ENTRIES, LEADERBOARD_REFRESH_INTERVAL)
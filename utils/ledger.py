@@ -0,0 +1,337 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from config import LEDGER_PATH, LEDGER_FLUSH_INTERVAL, PROCESSED_CLAIM_TTL, LOCAL_STORE_ENABLED
+from utils.sheets import plan_point_writes, point_values_written, sheets, write_point_values
+from utils.leaderboard import leaderboard_cache
+from utils.locks import sheet_locks
+from utils.store import point_store
+
+class PointLedger:
+    """
+    Write-behind journal for point updates.
+
+    Updates are stored in a local SQLite file as signed deltas as soon as a
+    command accepts them. `flush` folds every pending delta per
+    (sheet, worksheet, user, header), reads the cells once and writes their
+    new absolute values in one batch; rows are only marked flushed once the
+    sheet write succeeded, so pending deltas survive restarts.
+
+    Folding nets additions and removals before the zero clamp is applied, so
+    a removal that would have been clamped on its own can be absorbed by an
+    addition made in the same flush window.
+
+    Logged source messages are recorded in `processed_events`, keyed by
+    message ID with a hash of their content. A command claims the message
+    before building any updates and the claim is turned into "logged" in the
+    same transaction that journals the deltas, so retries and concurrent
+    logging of one message award points exactly once.
+
+    :param path: Path of the SQLite journal.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+        self._flush_lock = asyncio.Lock()
+        self.flushes = 0
+        self.flushed_deltas = 0
+        self.last_flush_at = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the journal and create its tables on first use."""
+        with self._lock:
+            if self._conn is None:
+                conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS point_deltas (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        sheet TEXT NOT NULL,
+                        worksheet_name TEXT NOT NULL,
+                        username TEXT NOT NULL,
+                        header TEXT NOT NULL,
+                        amount INTEGER NOT NULL,
+                        created_at REAL NOT NULL,
+                        flushed_at REAL
+                    )
+                """)
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_point_deltas_pending ON point_deltas (flushed_at, username, header)"
+                )
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS checkpoints (
+                        name TEXT PRIMARY KEY,
+                        value INTEGER NOT NULL,
+                        updated_at REAL NOT NULL
+                    )
+                """)
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS processed_events (
+                        message_id INTEGER PRIMARY KEY,
+                        content_hash TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        claimed_at REAL NOT NULL,
+                        logged_at REAL
+                    )
+                """)
+                self._conn = conn
+            return self._conn
+
+    def append(self, updates: list, message_ids: list[int] = ()) -> int:
+        """
+        Journal `plan_point_writes`-style updates and return how many were stored.
+
+        :param message_ids: Claimed source messages to mark as logged in the same transaction.
+        """
+        now = time.time()
+        rows = [
+            (
+                upd["sheet"],
+                upd["worksheet_name"],
+                upd["username"],
+                upd["header"],
+                upd["amount"] if upd["is_add"] else -upd["amount"],
+                now,
+            )
+            for upd in updates
+        ]
+        conn = self._connection()
+        with self._lock:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT INTO point_deltas (sheet, worksheet_name, username, header, amount, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.executemany(
+                "UPDATE processed_events SET status = 'logged', logged_at = ? WHERE message_id = ?",
+                [(now, message_id) for message_id in message_ids],
+            )
+            conn.execute("COMMIT")
+        return len(rows)
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        return hashlib.sha256(content.strip().encode("utf-8")).hexdigest()
+
+    def claim_event(self, message_id: int, content: str) -> dict | None:
+        """
+        Atomically claim a source message for logging.
+
+        Returns None when the claim succeeded, otherwise the existing record as
+        {"status": "claimed" | "logged", "same_content": bool}. Claims older than
+        PROCESSED_CLAIM_TTL that were never logged are treated as abandoned and
+        taken over.
+        """
+        digest = self.content_hash(content)
+        now = time.time()
+        conn = self._connection()
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT content_hash, status, claimed_at FROM processed_events WHERE message_id = ?",
+                (message_id,),
+            ).fetchone()
+            if row and (row[1] == "logged" or now - row[2] < PROCESSED_CLAIM_TTL):
+                conn.execute("COMMIT")
+                return {"status": row[1], "same_content": row[0] == digest}
+            conn.execute(
+                "INSERT OR REPLACE INTO processed_events (message_id, content_hash, status, claimed_at) "
+                "VALUES (?, ?, 'claimed', ?)",
+                (message_id, digest, now),
+            )
+            conn.execute("COMMIT")
+        return None
+
+    def release_event(self, message_id: int):
+        """Drop an unlogged claim so the message can be logged again."""
+        conn = self._connection()
+        with self._lock:
+            conn.execute(
+                "DELETE FROM processed_events WHERE message_id = ? AND status = 'claimed'",
+                (message_id,),
+            )
+
+    def pending(self) -> list[tuple]:
+        conn = self._connection()
+        with self._lock:
+            return conn.execute(
+                "SELECT id, sheet, worksheet_name, username, header, amount "
+                "FROM point_deltas WHERE flushed_at IS NULL ORDER BY id"
+            ).fetchall()
+
+    def pending_delta(self, username: str, header: str) -> int:
+        """Return the net amount still waiting to be written for `username`'s `header`."""
+        conn = self._connection()
+        with self._lock:
+            (total,) = conn.execute(
+                "SELECT COALESCE(SUM(amount), 0) FROM point_deltas "
+                "WHERE flushed_at IS NULL AND username = ? AND header = ?",
+                (username, header),
+            ).fetchone()
+        return total
+
+    @staticmethod
+    def fold(rows: list[tuple]) -> list[dict]:
+        """Net pending rows into one update per (sheet, worksheet, username, header)."""
+        totals = {}
+        for _, sheet, worksheet_name, username, header, amount in rows:
+            key = (sheet, worksheet_name, username, header)
+            totals[key] = totals.get(key, 0) + amount
+        return [
+            {
+                "sheet": sheet,
+                "worksheet_name": worksheet_name,
+                "username": username,
+                "header": header,
+                "amount": abs(amount),
+                "is_add": amount > 0,
+            }
+            for (sheet, worksheet_name, username, header), amount in totals.items()
+            if amount
+        ]
+
+    def mark_flushed(self, ids: list[int], apply=None):
+        """
+        Mark the deltas `ids` flushed. `apply(conn)`, if given, runs in the same
+        transaction, e.g. to apply the deltas to the local store.
+        """
+        now = time.time()
+        conn = self._connection()
+        with self._lock:
+            conn.execute("BEGIN")
+            try:
+                if apply is not None:
+                    apply(conn)
+                conn.executemany(
+                    "UPDATE point_deltas SET flushed_at = ? WHERE id = ?",
+                    [(now, delta_id) for delta_id in ids],
+                )
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    @staticmethod
+    async def _write_plan(gateway, plan: list):
+        """
+        Write a planned batch. The gateway only retries the write itself, which
+        carries absolute values and is safe to resend. If it still fails with
+        an error that does not prove the write was rejected (a 5xx or a lost
+        connection), the cells are re-read so a batch Google committed before
+        failing is not applied again on the next flush.
+        """
+        try:
+            await gateway.run(write_point_values, plan)
+        except Exception as e:
+            status = gateway.policy.status_of(e)
+            if status is not None and status < 500:
+                raise
+            try:
+                written = await gateway.run(point_values_written, plan)
+            except Exception:
+                raise e
+            if not written:
+                raise
+            print(f"Point write failed ({e}) but the sheet holds the new values, marking it flushed")
+
+    async def flush(self, gateway) -> int:
+        """
+        Write every pending delta to the sheets and return how many were flushed.
+
+        Each spreadsheet is written in one batch while holding the
+        `sheet_locks` of every sheet key it contains, so batches for different
+        spreadsheets run in parallel and structural changes (row inserts) never
+        interleave with a batch. A failed
+        spreadsheet keeps its deltas pending; the first error is re-raised after
+        the other spreadsheets were flushed.
+
+        With LOCAL_STORE_ENABLED the deltas go to the local store instead and
+        reach the sheets through the store sync.
+        """
+        async with self._flush_lock:
+            rows = self.pending()
+            if not rows:
+                return 0
+            by_spreadsheet = {}
+            for row in rows:
+                by_spreadsheet.setdefault(sheets[row[1]], []).append(row)
+
+            async def flush_spreadsheet(spreadsheet_rows):
+                updates = self.fold(spreadsheet_rows)
+                if LOCAL_STORE_ENABLED:
+                    self.mark_flushed([row[0] for row in spreadsheet_rows], lambda conn: point_store.apply(conn, updates))
+                    return len(spreadsheet_rows)
+                if updates:
+                    async with sheet_locks.hold(*{row[1] for row in spreadsheet_rows}):
+                        plan = await gateway.run(plan_point_writes, updates)
+                        await self._write_plan(gateway, plan)
+                self.mark_flushed([row[0] for row in spreadsheet_rows])
+                return len(spreadsheet_rows)
+
+            results = await asyncio.gather(
+                *(flush_spreadsheet(spreadsheet_rows) for spreadsheet_rows in by_spreadsheet.values()),
+                return_exceptions=True
+            )
+            flushed = sum(result for result in results if not isinstance(result, BaseException))
+            if flushed:
+                leaderboard_cache.invalidate()
+                self.flushes += 1
+                self.flushed_deltas += flushed
+                self.last_flush_at = time.time()
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            return flushed
+
+    async def run_flusher(self, gateway, interval: float = LEDGER_FLUSH_INTERVAL):
+        """Flush the ledger every `interval` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush(gateway)
+            except Exception as e:
+                print(f"Ledger flush failed, keeping deltas pending: {e}")
+
+    def get_checkpoint(self, name: str) -> int | None:
+        """Return the last value stored under checkpoint `name`, or None."""
+        conn = self._connection()
+        with self._lock:
+            row = conn.execute("SELECT value FROM checkpoints WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_checkpoint(self, name: str, value: int):
+        """Store `value` (e.g. the last processed message ID) under checkpoint `name`."""
+        conn = self._connection()
+        with self._lock:
+            conn.execute(
+                "INSERT INTO checkpoints (name, value, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                (name, value, time.time()),
+            )
+
+    def stats(self) -> dict:
+        conn = self._connection()
+        with self._lock:
+            (pending,) = conn.execute(
+                "SELECT COUNT(*) FROM point_deltas WHERE flushed_at IS NULL"
+            ).fetchone()
+        return {
+            "pending": pending,
+            "flushes": self.flushes,
+            "flushed_deltas": self.flushed_deltas,
+            "last_flush_at": self.last_flush_at,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+ledger = PointLedger(LEDGER_PATH)
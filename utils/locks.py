@@ -0,0 +1,74 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+class KeyedLock:
+    """
+    Async locks created on demand per key, so work on unrelated keys runs in
+    parallel and only work that touches the same key is serialized.
+
+    Keys are plain strings such as a sheet name ("Main") or a user on a sheet
+    ("Main:username"). `hold` takes several keys in sorted order, so two tasks
+    that need overlapping sets can never deadlock. A key's lock is dropped as
+    soon as nobody holds or waits for it.
+    """
+
+    def __init__(self):
+        self._locks = {}
+        self._users = {}
+        self.acquisitions = 0
+        self.contended = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def _acquire(self, key: str):
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._users[key] = self._users.get(key, 0) + 1
+        if lock.locked():
+            self.contended += 1
+        started_at = time.perf_counter()
+        try:
+            await lock.acquire()
+        except BaseException:
+            self._forget(key)
+            raise
+        waited = time.perf_counter() - started_at
+        self.acquisitions += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    def _release(self, key: str):
+        self._locks[key].release()
+        self._forget(key)
+
+    def _forget(self, key: str):
+        self._users[key] -= 1
+        if not self._users[key]:
+            del self._users[key]
+            del self._locks[key]
+
+    @asynccontextmanager
+    async def hold(self, *keys: str):
+        """Hold the locks of every key in `keys` for the duration of the block."""
+        ordered = sorted(set(keys))
+        acquired = []
+        try:
+            for key in ordered:
+                await self._acquire(key)
+                acquired.append(key)
+            yield
+        finally:
+            for key in reversed(acquired):
+                self._release(key)
+
+    def stats(self) -> dict:
+        return {
+            "held_keys": sum(1 for lock in self._locks.values() if lock.locked()),
+            "waiting": sum(self._users.values()) - sum(1 for lock in self._locks.values() if lock.locked()),
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+            "avg_wait_ms": round(self.total_wait / self.acquisitions * 1000, 2) if self.acquisitions else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+        }
+
+sheet_locks = KeyedLock()
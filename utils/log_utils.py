@@ -1,9 +1,140 @@
+import asyncio
+import contextvars
+import time
 import discord
 from discord.ext import commands
-from config import LOG_CHANNELS
+from config import LOG_CHANNELS, LOG_BATCH_WINDOW, LOG_CHANNEL_MIN_INTERVAL
+
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+_STOP = object()
+
+class LogQueue:
+    """
+    Background sender for audit-log embeds.
+
+    Embeds queued within `batch_window` seconds of each other are coalesced
+    into messages of up to 10 embeds (and 6000 characters), which are sent to
+    every log channel concurrently, at most one message per `min_interval`
+    seconds per channel.
+    """
+
+    def __init__(self, batch_window: float, min_interval: float):
+        self.batch_window = batch_window
+        self.min_interval = min_interval
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task = None
+        self._bot = None
+        self._last_sent: dict[int, float] = {}
+        self._channel_locks: dict[int, asyncio.Lock] = {}
+        self.queued = 0
+        self.sent_messages = 0
+        self.sent_embeds = 0
+        self.failed = 0
+
+    def start(self, bot: commands.Bot):
+        # A fresh context keeps the sends out of the metrics of whichever
+        # command happened to start the worker.
+        self._bot = bot
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), context=contextvars.Context())
+
+    def put(self, embed: discord.Embed):
+        self.queued += 1
+        self._queue.put_nowait(embed)
+
+    @staticmethod
+    def _batches(embeds: list[discord.Embed]) -> list[list[discord.Embed]]:
+        batches, current, size = [], [], 0
+        for embed in embeds:
+            length = len(embed)
+            if current and (len(current) == MAX_EMBEDS_PER_MESSAGE or size + length > MAX_EMBED_CHARS_PER_MESSAGE):
+                batches.append(current)
+                current, size = [], 0
+            current.append(embed)
+            size += length
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _collect(self) -> tuple[list[discord.Embed], bool]:
+        """Return the next batch of embeds and whether the stop sentinel ended it."""
+        embeds = []
+        item = await self._queue.get()
+        deadline = time.monotonic() + self.batch_window
+        while item is not _STOP:
+            embeds.append(item)
+            timeout = deadline - time.monotonic()
+            if len(embeds) == MAX_EMBEDS_PER_MESSAGE or timeout <= 0:
+                return embeds, False
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return embeds, False
+        return embeds, True
+
+    async def _send(self, channel_id: int, embeds: list[discord.Embed]):
+        channel = self._bot.get_channel(channel_id)
+        if not channel or not isinstance(channel, discord.TextChannel):
+            return
+        lock = self._channel_locks.setdefault(channel_id, asyncio.Lock())
+        async with lock:
+            wait = self._last_sent.get(channel_id, 0) + self.min_interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                await channel.send(embeds=embeds)
+                self.sent_messages += 1
+                self.sent_embeds += len(embeds)
+            except discord.HTTPException as e:
+                self.failed += 1
+                print(f"Failed to send log to channel {channel_id}: {e}")
+            finally:
+                self._last_sent[channel_id] = time.monotonic()
+
+    async def _deliver(self, embeds: list[discord.Embed]):
+        for batch in self._batches(embeds):
+            await asyncio.gather(*(self._send(channel_id, batch) for channel_id in LOG_CHANNELS))
+
+    async def _run(self):
+        while True:
+            embeds, stopping = await self._collect()
+            if embeds:
+                try:
+                    await self._deliver(embeds)
+                except Exception as e:
+                    print(f"Error delivering command logs: {e}")
+            if stopping:
+                return
+
+    async def close(self):
+        """
+        Stop the worker once it has sent everything queued so far. The worker
+        is signalled with a sentinel rather than cancelled, so a batch it has
+        already taken off the queue is still delivered.
+        """
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        if not task.done():
+            self._queue.put_nowait(_STOP)
+            await task
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.queued,
+            "pending": self._queue.qsize(),
+            "sent_messages": self.sent_messages,
+            "sent_embeds": self.sent_embeds,
+            "failed": self.failed,
+        }
+
+log_queue = LogQueue(LOG_BATCH_WINDOW, LOG_CHANNEL_MIN_INTERVAL)
+
 async def log_command(bot: commands.Bot, command_name: str, user: discord.User, guild: discord.Guild, **kwargs):
     """
-    Log command usage to all specified log channels using an embed.
+    Queue a log of command usage for all specified log channels using an embed.
+    Returns as soon as the embed is queued; `log_queue` sends it in the background.
 
     :param bot: The bot instance.
     :param command_name: The name of the command that was executed.
@@ -29,7 +160,19 @@ async def log_command(bot: commands.Bot, command_name: str, user: discord.User,
 
     embed.timestamp = discord.utils.utcnow()
 
-    for channel_id in LOG_CHANNELS:
-        channel = bot.get_channel(channel_id)
-        if channel and isinstance(channel, discord.TextChannel):
-            await channel.send(embed=embed)
\ No newline at end of file
+    log_queue.start(bot)
+    log_queue.put(embed)
+
+def log_alert(bot: commands.Bot, title: str, description: str):
+    """
+    Queue a warning embed for all log channels, e.g. when an API budget runs low.
+
+    :param bot: The bot instance.
+    :param title: The title of the alert.
+    :param description: What happened and what the bot is doing about it.
+    """
+    embed = discord.Embed(title=title, description=description, color=discord.Color.gold())
+    embed.timestamp = discord.utils.utcnow()
+
+    log_queue.start(bot)
+    log_queue.put(embed)
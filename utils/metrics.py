@@ -0,0 +1,197 @@
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from config import METRICS_FILE, METRICS_EXPORT_INTERVAL
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+BACKGROUND = "background"
+
+current_command: contextvars.ContextVar[str] = contextvars.ContextVar("current_command", default=BACKGROUND)
+
+class Histogram:
+    """Cumulative-bucket latency histogram in milliseconds, as Prometheus expects."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the `q` quantile, or None when empty."""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+class CommandMetrics:
+    def __init__(self):
+        self.latency = Histogram()
+        self.errors = 0
+        self.sheets_calls = 0
+        self.sheets_bytes_sent = 0
+        self.sheets_bytes_received = 0
+        self.discord_calls = 0
+        self.retries = 0
+
+class Metrics:
+    """
+    Process-wide counters attributed to the command that caused them.
+
+    The running command's name lives in the `current_command` context variable,
+    set by the bot's before-invoke hook; `SheetsGateway` copies the context into
+    its worker threads, so Sheets requests made on behalf of a command are
+    counted against it. Work outside any command is counted as "background".
+    Component statistics (caches, gateway, ledger) are read from registered
+    sources when a snapshot is taken.
+    """
+
+    def __init__(self):
+        self.commands: dict[str, CommandMetrics] = {}
+        self.sources = {}
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+    def _for(self, command: str) -> CommandMetrics:
+        entry = self.commands.get(command)
+        if entry is None:
+            entry = self.commands.setdefault(command, CommandMetrics())
+        return entry
+
+    def start_command(self, name: str) -> contextvars.Token:
+        return current_command.set(name)
+
+    def finish_command(self, name: str, elapsed_ms: float | None, failed: bool = False):
+        """Record a finished invocation; `elapsed_ms` is None when it failed before starting."""
+        with self._lock:
+            entry = self._for(name)
+            if elapsed_ms is not None:
+                entry.latency.observe(elapsed_ms)
+            if failed:
+                entry.errors += 1
+
+    def record_sheets_call(self, bytes_sent: int = 0, bytes_received: int = 0):
+        with self._lock:
+            entry = self._for(current_command.get())
+            entry.sheets_calls += 1
+            entry.sheets_bytes_sent += bytes_sent
+            entry.sheets_bytes_received += bytes_received
+
+    def record_discord_call(self):
+        with self._lock:
+            self._for(current_command.get()).discord_calls += 1
+
+    def record_retry(self):
+        with self._lock:
+            self._for(current_command.get()).retries += 1
+
+    def instrument_discord_http(self, http):
+        """Count every Discord REST request made through the bot's HTTP client."""
+        request = http.request
+
+        async def counted_request(route, **kwargs):
+            self.record_discord_call()
+            return await request(route, **kwargs)
+
+        http.request = counted_request
+
+    def register_source(self, name: str, stats):
+        """Register a zero-argument callable returning a dict of component statistics."""
+        self.sources[name] = stats
+
+    def snapshot(self) -> dict:
+        components = {}
+        for name, stats in self.sources.items():
+            try:
+                components[name] = stats()
+            except Exception as e:
+                components[name] = {"error": str(e)}
+        with self._lock:
+            commands = {
+                name: {
+                    "count": entry.latency.count,
+                    "errors": entry.errors,
+                    "latency_ms_sum": round(entry.latency.sum, 2),
+                    "latency_ms_p50": entry.latency.quantile(0.5),
+                    "latency_ms_p95": entry.latency.quantile(0.95),
+                    "latency_buckets": list(zip(entry.latency.buckets + (float("inf"),), entry.latency.counts)),
+                    "sheets_calls": entry.sheets_calls,
+                    "sheets_bytes_sent": entry.sheets_bytes_sent,
+                    "sheets_bytes_received": entry.sheets_bytes_received,
+                    "discord_calls": entry.discord_calls,
+                    "retries": entry.retries,
+                }
+                for name, entry in self.commands.items()
+            }
+        return {"uptime_s": round(time.time() - self.started_at), "commands": commands, "components": components}
+
+    def render_prometheus(self) -> str:
+        """Render a snapshot in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        commands = snapshot["commands"]
+        lines = ["# TYPE cglogger_command_latency_ms histogram"]
+        for name, entry in commands.items():
+            cumulative = 0
+            for bound, count in entry["latency_buckets"]:
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else str(bound)
+                lines.append(f'cglogger_command_latency_ms_bucket{{command="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'cglogger_command_latency_ms_sum{{command="{name}"}} {entry["latency_ms_sum"]}')
+            lines.append(f'cglogger_command_latency_ms_count{{command="{name}"}} {entry["count"]}')
+        for family, key in (
+            ("cglogger_command_errors_total", "errors"),
+            ("cglogger_sheets_calls_total", "sheets_calls"),
+            ("cglogger_discord_calls_total", "discord_calls"),
+            ("cglogger_retries_total", "retries"),
+        ):
+            lines.append(f"# TYPE {family} counter")
+            lines += [f'{family}{{command="{name}"}} {entry[key]}' for name, entry in commands.items()]
+        lines.append("# TYPE cglogger_sheets_bytes_total counter")
+        for direction in ("sent", "received"):
+            lines += [
+                f'cglogger_sheets_bytes_total{{command="{name}",direction="{direction}"}} {entry[f"sheets_bytes_{direction}"]}'
+                for name, entry in commands.items()
+            ]
+        lines.append("# TYPE cglogger_component gauge")
+        for source, stats in snapshot["components"].items():
+            for stat, value in stats.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    lines.append(f'cglogger_component{{source="{source}",stat="{stat}"}} {value}')
+        lines.append("# TYPE cglogger_uptime_seconds gauge")
+        lines.append(f"cglogger_uptime_seconds {snapshot['uptime_s']}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str = METRICS_FILE):
+        """Atomically replace `path` with the current metrics, for a textfile collector."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(temp_path, path)
+
+    async def run_exporter(self, path: str = METRICS_FILE, interval: float = METRICS_EXPORT_INTERVAL):
+        """Rewrite the Prometheus file every `interval` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.write_prometheus(path)
+            except OSError as e:
+                print(f"Failed to write metrics to {path}: {e}")
+
+metrics = Metrics()
@@ -0,0 +1,186 @@
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from config import PARSE_CACHE_SIZE, PARSE_CACHE_TTL
+
+MENTION_RE = re.compile(r"<@!?(\d+)>")
+EXTRA_POINTS_RE = re.compile(r"<@!?(\d+)>\s*\((\d+)\)")
+LEADING_INT_RE = re.compile(r"\d+")
+
+EVENT_FIELDS = ("Event", "Hosted by", "Supervisor", "Co-host", "Attendees", "Notes", "Proof", "EP for event", "CEP for event", "Extra points", "Ping")
+ACTIVITY_FIELDS = ("Username", "Time Started", "Time Ended", "Time logged", "Total time logged", "Proof")
+
+_EVENT_LABELS = {label.lower(): label for label in EVENT_FIELDS}
+_ACTIVITY_LABELS = {label.lower(): label for label in ACTIVITY_FIELDS}
+
+_LIST_MARKERS = " \t-*•>·+"
+
+def _scan(labels: dict[str, str], content: str) -> dict[str, str]:
+    """
+    Collect the first value of every `Label: value` line in a single pass over
+    `content`. Labels are matched case-insensitively, may follow a list marker
+    (`- `, `• `, `> `) and may be wrapped in markdown emphasis (e.g. `**Event:**`).
+    A label with nothing after it takes the following lines, up to the next
+    known label, as its value (e.g. attendee mentions listed under `Attendees:`).
+    """
+    fields = {}
+    continuing = None
+    for line in content.splitlines():
+        label, separator, value = line.lstrip(_LIST_MARKERS).partition(":")
+        label = labels.get(label.strip(" *_").lower()) if separator else None
+        if label is None:
+            if continuing and line.strip():
+                fields[continuing] = f"{fields[continuing]}\n{line.strip()}".lstrip()
+            continue
+        continuing = None
+        if label not in fields:
+            fields[label] = value.strip(" *_\t")
+            if not fields[label]:
+                continuing = label
+    return fields
+
+def _first_mention(value: str | None) -> int | None:
+    if value is None:
+        return None
+    match = MENTION_RE.search(value)
+    return int(match.group(1)) if match else None
+
+def _to_int(value: str | None) -> int | None:
+    if value is None:
+        return None
+    match = LEADING_INT_RE.match(value)
+    return int(match.group(0)) if match else None
+
+def name_from_field(value: str) -> str:
+    """Return the name part of an unmentioned `[Rank] | Name | TZ` field."""
+    return value.split("|")[1].strip() if "|" in value else value
+
+@dataclass
+class EventLog:
+    """Structured contents of an event-log message."""
+    point_type: str
+    event: str | None = None
+    host: str | None = None
+    host_id: int | None = None
+    supervisor: str | None = None
+    supervisor_id: int | None = None
+    cohost: str | None = None
+    cohost_id: int | None = None
+    attendees: str | None = None
+    attendee_ids: list[int] = field(default_factory=list)
+    extra_points: str | None = None
+    extra_point_ids: list[tuple[int, int]] = field(default_factory=list)
+    point_value: int | None = None
+    missing: list[str] = field(default_factory=list)
+
+    def mention_ids(self) -> list[int]:
+        """Every user ID mentioned in a field that awards points."""
+        ids = [self.host_id, self.supervisor_id, self.cohost_id, *self.attendee_ids]
+        ids += [user_id for user_id, _ in self.extra_point_ids]
+        return [user_id for user_id in ids if user_id is not None]
+
+@dataclass
+class ActivityLog:
+    """Structured contents of an activity-log message."""
+    username: str | None = None
+    username_id: int | None = None
+    time_started: str | None = None
+    time_ended: str | None = None
+    time_logged: int | None = None
+    total_time_logged: str | None = None
+    missing: list[str] = field(default_factory=list)
+
+def parse_event_log(content: str, point_type: str) -> EventLog:
+    """
+    Parse an event-log message in one pass.
+
+    :param content: The message content.
+    :param point_type: "EP" for division-wide events, "CEP" for company events.
+    :return: An EventLog; `missing` lists the required fields that were absent.
+    """
+    fields = _scan(_EVENT_LABELS, content)
+    point_field = f"{point_type} for event"
+    required = ["Event", "Hosted by", "Attendees", "Proof", point_field]
+
+    record = EventLog(
+        point_type=point_type,
+        event=fields.get("Event"),
+        host=fields.get("Hosted by"),
+        supervisor=fields.get("Supervisor"),
+        cohost=fields.get("Co-host"),
+        attendees=fields.get("Attendees"),
+        extra_points=fields.get("Extra points"),
+        point_value=_to_int(fields.get(point_field)),
+        missing=[f"{label}:" for label in required if label not in fields],
+    )
+    record.host_id = _first_mention(record.host)
+    record.supervisor_id = _first_mention(record.supervisor)
+    record.cohost_id = _first_mention(record.cohost)
+    if record.attendees:
+        record.attendee_ids = [int(user_id) for user_id in MENTION_RE.findall(record.attendees)]
+    if record.extra_points:
+        record.extra_point_ids = [(int(user_id), int(points)) for user_id, points in EXTRA_POINTS_RE.findall(record.extra_points)]
+    return record
+
+def parse_activity_log(content: str) -> ActivityLog:
+    """
+    Parse an activity-log message in one pass.
+
+    :param content: The message content.
+    :return: An ActivityLog; `missing` lists the required fields that were absent.
+    """
+    fields = _scan(_ACTIVITY_LABELS, content)
+    record = ActivityLog(
+        username=fields.get("Username"),
+        time_started=fields.get("Time Started"),
+        time_ended=fields.get("Time Ended"),
+        time_logged=_to_int(fields.get("Time logged")),
+        total_time_logged=fields.get("Total time logged"),
+        missing=[f"{label}:" for label in ACTIVITY_FIELDS if label not in fields],
+    )
+    record.username_id = _first_mention(record.username)
+    if record.username and record.username_id is None:
+        record.username = record.username.split()[0] if record.username.split() else None
+    return record
+
+class ParsedLogCache:
+    """
+    LRU cache with a TTL of validated log messages and their parsed records,
+    keyed by message ID, so commands can reuse what `on_message` already parsed.
+
+    :param maxsize: Maximum number of messages kept.
+    :param ttl: Seconds a parsed record stays fresh.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def put(self, message, record):
+        self._entries[message.id] = (time.monotonic() + self.ttl, message, record)
+        self._entries.move_to_end(message.id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get(self, message_id: int):
+        """Return (message, record) if a fresh entry exists, otherwise None."""
+        entry = self._entries.get(message_id)
+        if entry is None or entry[0] < time.monotonic():
+            self._entries.pop(message_id, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(message_id)
+        self.hits += 1
+        return entry[1], entry[2]
+
+    def discard(self, message_id: int):
+        self._entries.pop(message_id, None)
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+parsed_logs = ParsedLogCache(PARSE_CACHE_SIZE, PARSE_CACHE_TTL)
@@ -0,0 +1,249 @@
+import math
+import random
+import threading
+import time
+from collections import deque
+from gspread.exceptions import APIError
+from config import (
+    SHEETS_REQUESTS_PER_MINUTE,
+    SHEETS_MAX_ATTEMPTS,
+    SHEETS_BACKOFF_BASE,
+    SHEETS_BACKOFF_CAP,
+    SHEETS_RETRY_BUDGET_PER_MINUTE,
+    SHEETS_READ_QUOTA_PER_MINUTE,
+    SHEETS_WRITE_QUOTA_PER_MINUTE,
+    SHEETS_QUOTA_LOW_WATERMARK,
+    SHEETS_QUOTA_WARN_COOLDOWN,
+)
+
+RETRYABLE_STATUSES = {429, 500, 502, 503}
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every Sheets request in the process.
+
+    :param capacity: Maximum burst size (tokens).
+    :param per_minute: Tokens added back per minute.
+    """
+
+    def __init__(self, capacity: int, per_minute: int):
+        self.capacity = capacity
+        self.rate = per_minute / 60
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self, tokens: int = 1) -> float:
+        """Take `tokens` now and return how long the caller must wait before using them."""
+        with self._lock:
+            self._refill()
+            self.tokens -= tokens
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def wait_time(self, tokens: int = 1) -> float:
+        """Return how long until `tokens` are available, without taking them."""
+        with self._lock:
+            self._refill()
+            if self.tokens >= tokens:
+                return 0.0
+            return (tokens - self.tokens) / self.rate
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """Take `tokens` if they are available right now, without waiting."""
+        with self._lock:
+            self._refill()
+            if self.tokens < tokens:
+                return False
+            self.tokens -= tokens
+            return True
+
+    def acquire(self, tokens: int = 1):
+        """Block the calling (worker) thread until `tokens` are available."""
+        delay = self.reserve(tokens)
+        if delay:
+            self.waited += delay
+            time.sleep(delay)
+
+    def drain(self, seconds: float):
+        """Empty the bucket so no request is sent for about `seconds` (used after a 429)."""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff with Retry-After support and a retry budget
+    shared by every caller, so a quota outage cannot multiply the traffic.
+
+    :param max_attempts: Attempts per call, including the first one.
+    :param base: Backoff ceiling of the first retry, in seconds.
+    :param cap: Largest backoff ceiling, in seconds.
+    :param budget_per_minute: Retries allowed per minute across the whole process.
+    """
+
+    def __init__(self, max_attempts: int, base: float, cap: float, budget_per_minute: int):
+        self.max_attempts = max_attempts
+        self.base = base
+        self.cap = cap
+        self.budget = TokenBucket(budget_per_minute, budget_per_minute)
+        self.retries = 0
+        self.exhausted = 0
+
+    @staticmethod
+    def status_of(error: Exception) -> int | None:
+        if isinstance(error, APIError) and error.response is not None:
+            return error.response.status_code
+        return None
+
+    @staticmethod
+    def retry_after(error: Exception) -> float | None:
+        """Return the Retry-After delay sent with `error`, in seconds, if any."""
+        value = None
+        if isinstance(error, APIError) and error.response is not None:
+            value = error.response.headers.get("Retry-After")
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            return None
+
+    def is_rate_limited(self, error: Exception) -> bool:
+        return self.status_of(error) == 429
+
+    def is_retryable(self, error: Exception) -> bool:
+        return self.status_of(error) in RETRYABLE_STATUSES
+
+    def next_delay(self, error: Exception, attempt: int) -> float | None:
+        """
+        Return how long to wait before retrying after `error` on `attempt`
+        (0-based), or None if the call should not be retried.
+        """
+        if self.status_of(error) not in RETRYABLE_STATUSES or attempt + 1 >= self.max_attempts:
+            return None
+        if not self.budget.try_acquire():
+            self.exhausted += 1
+            return None
+        self.retries += 1
+        delay = random.uniform(0, min(self.cap, self.base * 2 ** attempt))
+        retry_after = self.retry_after(error)
+        return max(delay, retry_after) if retry_after is not None else delay
+
+class QuotaAccountant:
+    """
+    Sliding-window count of the Sheets read and write requests sent in the last
+    minute, checked against the per-minute quotas so low-priority work can back
+    off before Google starts answering 429.
+
+    Requests are classified by HTTP method: GET is a read, anything else a write.
+    When a quota's remaining budget drops to `low_watermark` of it, every
+    registered listener is called with (kind, remaining, quota), at most once
+    per `warn_cooldown` seconds per kind. Listeners run on the thread that sent
+    the request.
+
+    :param read_quota: Read requests allowed per window.
+    :param write_quota: Write requests allowed per window.
+    :param low_watermark: Fraction of a quota left at which the budget counts as low.
+    :param warn_cooldown: Minimum seconds between two low-budget notifications of a kind.
+    :param window: Length of the sliding window, in seconds.
+    """
+
+    def __init__(self, read_quota: int, write_quota: int, low_watermark: float, warn_cooldown: float, window: float = 60.0):
+        self.quotas = {"read": read_quota, "write": write_quota}
+        self.low_watermark = low_watermark
+        self.warn_cooldown = warn_cooldown
+        self.window = window
+        self.deferred = 0
+        self.warnings = 0
+        self._sent = {"read": deque(), "write": deque()}
+        self._warned_at = {"read": None, "write": None}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def kind_of(method: str) -> str:
+        return "read" if method.upper() == "GET" else "write"
+
+    def _expire(self, now: float):
+        for sent in self._sent.values():
+            while sent and now - sent[0] >= self.window:
+                sent.popleft()
+
+    def _floor(self, kind: str) -> float:
+        return self.quotas[kind] * self.low_watermark
+
+    def record(self, method: str):
+        """Count one request sent with HTTP `method`."""
+        kind = self.kind_of(method)
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            self._sent[kind].append(now)
+            remaining = self.quotas[kind] - len(self._sent[kind])
+            warned_at = self._warned_at[kind]
+            notify = remaining <= self._floor(kind) and (warned_at is None or now - warned_at >= self.warn_cooldown)
+            if notify:
+                self._warned_at[kind] = now
+                self.warnings += 1
+        if notify:
+            for listener in self._listeners:
+                listener(kind, remaining, self.quotas[kind])
+
+    def remaining(self) -> dict:
+        """Return the requests of each kind still available in the current window."""
+        with self._lock:
+            self._expire(time.monotonic())
+            return {kind: self.quotas[kind] - len(sent) for kind, sent in self._sent.items()}
+
+    def is_low(self, *kinds: str) -> bool:
+        remaining = self.remaining()
+        return any(remaining[kind] <= self._floor(kind) for kind in kinds or self.quotas)
+
+    def allow_low_priority(self, *kinds: str) -> bool:
+        """
+        Return whether low-priority work issuing requests of `kinds` (reads by
+        default) may run now; counts a deferral when it may not.
+        """
+        if self.is_low(*(kinds or ("read",))):
+            with self._lock:
+                self.deferred += 1
+            return False
+        return True
+
+    def recovers_in(self, kind: str = "read") -> float:
+        """Seconds until enough requests of `kind` leave the window to lift it above the low watermark."""
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            sent = self._sent[kind]
+            excess = len(sent) - math.ceil(self.quotas[kind] - self._floor(kind))
+            if excess < 0:
+                return 0.0
+            return max(0.0, self.window - (now - sent[excess]))
+
+    def on_low(self, listener):
+        """Register `listener(kind, remaining, quota)` to be called when a budget runs low."""
+        self._listeners.append(listener)
+
+    def stats(self) -> dict:
+        remaining = self.remaining()
+        return {
+            "read_remaining": remaining["read"],
+            "read_quota": self.quotas["read"],
+            "write_remaining": remaining["write"],
+            "write_quota": self.quotas["write"],
+            "deferred": self.deferred,
+            "warnings": self.warnings,
+        }
+
+sheets_bucket = TokenBucket(SHEETS_REQUESTS_PER_MINUTE, SHEETS_REQUESTS_PER_MINUTE)
+retry_policy = RetryPolicy(SHEETS_MAX_ATTEMPTS, SHEETS_BACKOFF_BASE, SHEETS_BACKOFF_CAP, SHEETS_RETRY_BUDGET_PER_MINUTE)
+quota_accountant = QuotaAccountant(
+    SHEETS_READ_QUOTA_PER_MINUTE, SHEETS_WRITE_QUOTA_PER_MINUTE, SHEETS_QUOTA_LOW_WATERMARK, SHEETS_QUOTA_WARN_COOLDOWN
+)
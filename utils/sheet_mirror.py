@@ -0,0 +1,288 @@
+import bisect
+import threading
+import time
+import gspread
+
+def _trimmed(row: list[str]) -> list[str]:
+    row = list(row)
+    while row and not row[-1]:
+        row.pop()
+    return row
+
+class WorksheetMirror:
+    """
+    Local copy of a worksheet's values with a cell-value → row index.
+
+    The mirror is loaded with a single `get_all_values()` call and then kept in
+    step with the bot's own writes through `set_cell` and `insert_row`, so
+    lookups only hit the network when the copy is stale or a name is missing.
+
+    The mirror also keeps a section header map (header row → header name →
+    column) so column lookups never touch the network.
+
+    :param sheet_key: Key of the sheet in `utils.sheets.sheets` ("Main", "Officer").
+    :param worksheet_name: Title of the mirrored worksheet.
+    :param ttl: Seconds after which the whole mirror is reloaded.
+    :param miss_refresh: Minimum seconds between reloads triggered by a lookup miss.
+    :param header_rows: Expected 1-indexed section header rows, if known.
+    :param header_anchor: Header name every section header row contains, used
+        to check `header_rows` and to find the rows again when they move.
+    :param probe_columns: (first, last) 1-indexed columns polled for hand edits;
+        the first one must be the username column.
+    """
+
+    def __init__(
+        self,
+        sheet_key: str,
+        worksheet_name: str,
+        ttl: float,
+        miss_refresh: float,
+        header_rows: list[int] = None,
+        header_anchor: str = None,
+        probe_columns: tuple[int, int] = None,
+    ):
+        self.sheet_key = sheet_key
+        self.worksheet_name = worksheet_name
+        self.ttl = ttl
+        self.miss_refresh = miss_refresh
+        self.header_anchor = header_anchor
+        self.probe_columns = probe_columns
+        self.header_rows: list[int] = sorted(header_rows or [])
+        self.headers: dict[int, dict[str, int]] = {}
+        self.rows: list[list[str]] = []
+        self.index: dict[str, int] = {}
+        self.loaded_at = None
+        self.loads = 0
+        self.hits = 0
+        self.misses = 0
+        self.probes = 0
+        self.probe_changes = 0
+        self._lock = threading.RLock()
+
+    def is_stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.ttl
+
+    def can_refresh_on_miss(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.miss_refresh
+
+    def load(self, worksheet):
+        """Replace the mirror with the current contents of `worksheet`."""
+        values = worksheet.get_all_values()
+        with self._lock:
+            self.rows = values
+            self._reindex()
+            self._locate_headers()
+            self.loaded_at = time.monotonic()
+            self.loads += 1
+
+    def invalidate(self):
+        with self._lock:
+            self.loaded_at = None
+
+    def _reindex(self):
+        index = {}
+        for row_index, row in enumerate(self.rows, start=1):
+            for value in row:
+                if value and value not in index:
+                    index[value] = row_index
+        self.index = index
+
+    def _locate_headers(self):
+        """Build the header map, rediscovering the header rows if they no longer hold the anchor."""
+        if self.header_anchor:
+            expected = self.header_rows
+            if not expected or any(self.header_anchor not in self._row(r) for r in expected):
+                found = [r for r, row in enumerate(self.rows, start=1) if self.header_anchor in row]
+                if expected and found != expected:
+                    print(f"Header rows in '{self.worksheet_name}' moved from {expected} to {found}")
+                self.header_rows = found
+        self._build_header_map()
+
+    def _build_header_map(self):
+        headers = {}
+        for header_row in self.header_rows:
+            columns = {}
+            for col_index, value in enumerate(self._row(header_row), start=1):
+                if value and value not in columns:
+                    columns[value] = col_index
+            headers[header_row] = columns
+        self.headers = headers
+
+    def _row(self, row_index: int) -> list[str]:
+        return self.rows[row_index - 1] if 0 < row_index <= len(self.rows) else []
+
+    def column_index(self, user_row: int, header_name: str) -> int | None:
+        """
+        Return the 1-indexed column of `header_name` for the section containing
+        `user_row`, searching the nearest header row first and moving upward.
+        """
+        with self._lock:
+            position = bisect.bisect_right(self.header_rows, user_row)
+            for header_row in reversed(self.header_rows[:position]):
+                col_index = self.headers[header_row].get(header_name)
+                if col_index:
+                    return col_index
+            for row_index in range(min(user_row, len(self.rows)), 0, -1):
+                row = self.rows[row_index - 1]
+                if header_name in row:
+                    return row.index(header_name) + 1
+        return None
+
+    def probe_ranges(self) -> list[str]:
+        """Return the A1 ranges `apply_probe` expects: the probed columns, then each header row."""
+        first, last = self.probe_columns
+        first_letter = gspread.utils.rowcol_to_a1(1, first)[:-1]
+        last_letter = gspread.utils.rowcol_to_a1(1, last)[:-1]
+        with self._lock:
+            header_rows = list(self.header_rows)
+        return [
+            gspread.utils.absolute_range_name(self.worksheet_name, range_name)
+            for range_name in [f"{first_letter}:{last_letter}"] + [f"{r}:{r}" for r in header_rows]
+        ]
+
+    def apply_probe(self, value_ranges: list[dict]) -> set[str]:
+        """
+        Compare a `values.batchGet` of `probe_ranges()` with the local copy and
+        return what changed: "rows" when the username column differs (rows were
+        added, removed or moved, so the mirror must be reloaded), "headers" when
+        a header row differs, "values" when another probed cell differs.
+        Header rows and probed values are patched in place; nothing is patched
+        when "rows" is returned.
+        """
+        first, last = self.probe_columns
+        columns = value_ranges[0].get("values", [])
+        with self._lock:
+            self.probes += 1
+            header_rows = list(self.header_rows)
+            height = max(len(columns), len(self.rows))
+
+            def probed(row_index, col_index):
+                row = columns[row_index - 1] if row_index <= len(columns) else []
+                offset = col_index - first
+                return row[offset] if offset < len(row) else ""
+
+            def local(row_index, col_index):
+                return self.cell(row_index, col_index) or ""
+
+            if any(probed(r, first) != local(r, first) for r in range(1, height + 1)):
+                self.probe_changes += 1
+                return {"rows"}
+
+            changes = set()
+            for header_row, value_range in zip(header_rows, value_ranges[1:]):
+                values = (value_range.get("values") or [[]])[0]
+                if _trimmed(self._row(header_row)) != _trimmed(values):
+                    while len(self.rows) < header_row:
+                        self.rows.append([])
+                    self.rows[header_row - 1] = list(values)
+                    changes.add("headers")
+            if "headers" in changes:
+                self._reindex()
+                self._locate_headers()
+
+            for row_index in range(1, height + 1):
+                for col_index in range(first + 1, last + 1):
+                    value = probed(row_index, col_index)
+                    if value != local(row_index, col_index):
+                        self.set_cell(row_index, col_index, value)
+                        changes.add("values")
+            if changes:
+                self.probe_changes += 1
+        return changes
+
+    def header_name(self, user_row: int, col_index: int) -> str | None:
+        """Return the header of column `col_index` in the section containing `user_row`."""
+        with self._lock:
+            position = bisect.bisect_right(self.header_rows, user_row)
+            if not position:
+                return None
+            header_row = self._row(self.header_rows[position - 1])
+            if 0 < col_index <= len(header_row):
+                return header_row[col_index - 1] or None
+        return None
+
+    def records(self, username_col: int) -> list[tuple[str, str, str]]:
+        """
+        Return (username, header, value) for every non-empty cell under a section
+        header, taking the username from column `username_col` of each row.
+        """
+        records = []
+        with self._lock:
+            bounds = self.header_rows[1:] + [len(self.rows) + 1]
+            for header_row, next_header_row in zip(self.header_rows, bounds):
+                header = self._row(header_row)
+                for row in self.rows[header_row:next_header_row - 1]:
+                    username = row[username_col - 1] if len(row) >= username_col else ""
+                    if not username:
+                        continue
+                    for col_index, value in enumerate(row, start=1):
+                        if value and col_index != username_col and col_index <= len(header) and header[col_index - 1]:
+                            records.append((username, header[col_index - 1], value))
+        return records
+
+    def find(self, username: str) -> int | None:
+        """Return the 1-indexed row containing `username`, or None."""
+        with self._lock:
+            row_index = self.index.get(username)
+        if row_index:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return row_index
+
+    def row(self, row_index: int) -> list[str]:
+        with self._lock:
+            if 0 < row_index <= len(self.rows):
+                return list(self.rows[row_index - 1])
+            return []
+
+    def cell(self, row_index: int, col_index: int) -> str | None:
+        with self._lock:
+            if 0 < row_index <= len(self.rows):
+                row = self.rows[row_index - 1]
+                if 0 < col_index <= len(row):
+                    return row[col_index - 1]
+            return None
+
+    def set_cell(self, row_index: int, col_index: int, value):
+        """Apply a write the bot made to the sheet to the local copy."""
+        with self._lock:
+            if self.loaded_at is None or row_index <= 0:
+                return
+            while len(self.rows) < row_index:
+                self.rows.append([])
+            row = self.rows[row_index - 1]
+            while len(row) < col_index:
+                row.append("")
+            old_value = row[col_index - 1]
+            row[col_index - 1] = "" if value is None else str(value)
+            if row_index in self.headers:
+                self._build_header_map()
+            if old_value and self.index.get(old_value) == row_index:
+                self._reindex()
+            elif row[col_index - 1] and row[col_index - 1] not in self.index:
+                self.index[row[col_index - 1]] = row_index
+
+    def insert_row(self, row_index: int, values: list):
+        """Apply an `insert_row` the bot made to the sheet to the local copy."""
+        with self._lock:
+            if self.loaded_at is None:
+                return
+            while len(self.rows) < row_index - 1:
+                self.rows.append([])
+            self.rows.insert(row_index - 1, ["" if v is None else str(v) for v in values])
+            self._reindex()
+            self.header_rows = [r + 1 if r >= row_index else r for r in self.header_rows]
+            self._build_header_map()
+
+    def stats(self) -> dict:
+        return {
+            "rows": len(self.rows),
+            "indexed": len(self.index),
+            "header_rows": list(self.header_rows),
+            "loads": self.loads,
+            "hits": self.hits,
+            "misses": self.misses,
+            "probes": self.probes,
+            "probe_changes": self.probe_changes,
+        }
@@ -1,87 +1,250 @@
+import threading
 import time
 import gspread
+from gspread.exceptions import APIError
+from gspread.http_client import HTTPClient
 from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
-from functools import lru_cache
+from config import CREDS_FILE, SHEET_MIRROR_TTL, SHEET_MIRROR_MISS_REFRESH, SHEETS_BACKOFF_BASE, QUOTA_SNAPSHOT_TTL, LOCAL_STORE_ENABLED
+from utils.color_snapshot import ColorSnapshot
+from utils.metrics import metrics
+from utils.rate_limit import sheets_bucket, retry_policy, quota_accountant
+from utils.sheet_mirror import WorksheetMirror
+from utils.store import point_store
 
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
-CREDS = Credentials.from_service_account_file("creds.json", scopes=SCOPES)
 MAIN_SHEET_HEADER_ROWS = [16, 46, 93, 171] 
+OFFICER_SHEET_HEADER_ROWS = []
+STRUCTURAL_ERROR_STATUSES = {400, 401, 404}
+USERNAME_COLUMN = 4
 
-def retry_with_backoff(func):
-    def wrapper(*args, **kwargs):
-        max_retries = 5
-        backoff = 1
-        for attempt in range(max_retries):
-            try:
-                return func(*args, **kwargs)
-            except Exception as e:
-                if 'Quota exceeded' in str(e):
-                    print(f"Rate limit exceeded, retrying in {backoff} seconds...")
-                    time.sleep(backoff)
-                    backoff *= 2
-                else:
-                    raise
-        raise Exception("Max retries exceeded")
-    return wrapper
-
-@retry_with_backoff
-def batch_update_points(updates: list):
+class ThrottledHTTPClient(HTTPClient):
+    """
+    gspread HTTP client that takes a token from the shared bucket before every
+    request and counts it against the per-minute read/write quotas.
+    """
+
+    def request(self, method, *args, **kwargs):
+        sheets_bucket.acquire()
+        quota_accountant.record(method)
+        try:
+            response = super().request(method, *args, **kwargs)
+        except APIError as e:
+            _record_call(e.response)
+            if retry_policy.is_rate_limited(e):
+                sheets_bucket.drain(retry_policy.retry_after(e) or SHEETS_BACKOFF_BASE)
+            elif e.response.status_code in STRUCTURAL_ERROR_STATUSES:
+                reset_handles()
+            raise
+        _record_call(response)
+        return response
+
+def _record_call(response):
+    """Count a Sheets request, and its bytes, against the running command."""
+    body = getattr(getattr(response, "request", None), "body", None) or b""
+    metrics.record_sheets_call(len(body), len(response.content or b""))
+
+def _apply_delta(current_value, amount, is_add):
+    try:
+        current_value = int(current_value)
+    except (ValueError, TypeError):
+        current_value = 0
+    return current_value + amount if is_add else max(0, current_value - amount)
+
+def plan_point_writes(updates: list) -> list[dict]:
+    """
+    Read the cells touched by point updates with one `values.batchGet` per
+    spreadsheet and return the absolute values to write, as
+    [{"sheet": sheet key, "data": [{"range": ..., "values": [[value]]}, ...]}, ...].
+
+    Each update is a dict with `sheet`, `worksheet_name`, `username`, `header`,
+    `amount` and `is_add`. EP/CEP updates also touch the matching "Total" column.
+    Several updates to the same cell are folded in memory in the order given.
+
+    Planning only reads, so it can be retried freely. The plan holds target
+    values rather than deltas, so `write_point_values` can be retried too; a
+    retry of the two together would re-read a committed write and apply the
+    deltas twice.
+    """
     grouped = {}
     for upd in updates:
-        key = upd["sheet"]
-        grouped.setdefault(key, []).append(upd)
-    
-    for sheet_key, ups in grouped.items():
-        spreadsheet = client.open_by_key(sheets[sheet_key])
-        worksheet_name = ups[0]["worksheet_name"]
-        worksheet = spreadsheet.worksheet(worksheet_name)
-        cell_updates = []
-        for upd in ups:
-            row_index = get_row_by_username(sheet_key, upd["username"])
-            if not row_index:
-                print(f"User {upd['username']} not found in {sheet_key} sheet")
-                continue
-            col_index = get_column_index(worksheet, row_index, upd["header"])
+        grouped.setdefault(sheets[upd["sheet"]], []).append(upd)
+
+    plan = []
+    for ups in grouped.values():
+        operations = _plan_point_updates(ups)
+        if not operations:
+            continue
+
+        spreadsheet = open_spreadsheet(ups[0]["sheet"])
+        targets = list(operations)
+        ranges = [
+            gspread.utils.absolute_range_name(worksheet_name, gspread.utils.rowcol_to_a1(row_index, col_index))
+            for worksheet_name, row_index, col_index in targets
+        ]
+        response = spreadsheet.values_batch_get(ranges)
+
+        data = []
+        for target, cell_range, value_range in zip(targets, ranges, response.get("valueRanges", [])):
+            values = value_range.get("values", [[None]])
+            new_value = values[0][0] if values and values[0] else None
+            for amount, is_add in operations[target]:
+                new_value = _apply_delta(new_value, amount, is_add)
+            data.append({"range": cell_range, "values": [[new_value]]})
+        plan.append({"sheet": ups[0]["sheet"], "data": data})
+    return plan
+
+def write_point_values(plan: list) -> int:
+    """
+    Write a `plan_point_writes` plan with one `values.batchUpdate` per
+    spreadsheet and return the number of cells written.
+    """
+    written = 0
+    for batch in plan:
+        open_spreadsheet(batch["sheet"]).values_batch_update({"valueInputOption": "RAW", "data": batch["data"]})
+        _record_point_writes(batch["data"])
+        written += len(batch["data"])
+    return written
+
+def point_values_written(plan: list) -> bool:
+    """
+    Re-read the cells of a `plan_point_writes` plan and return True if they all
+    hold their target values, i.e. a write that failed in transit was applied.
+    """
+    for batch in plan:
+        ranges = [cell["range"] for cell in batch["data"]]
+        response = open_spreadsheet(batch["sheet"]).values_batch_get(ranges)
+        for cell, value_range in zip(batch["data"], response.get("valueRanges", [])):
+            values = value_range.get("values", [[None]])
+            current_value = values[0][0] if values and values[0] else None
+            if str(current_value) != str(cell["values"][0][0]):
+                return False
+    for batch in plan:
+        _record_point_writes(batch["data"])
+    return True
+
+def _record_point_writes(data: list):
+    """Reflect written point cells in the mirrors and the quota snapshot."""
+    for cell in data:
+        worksheet_name, cell_range = cell["range"].split("!", 1)
+        worksheet_name = worksheet_name.strip("'").replace("''", "'")
+        if worksheet_name == quota_snapshot.worksheet_name:
+            quota_snapshot.invalidate()
+        _mirror_writes(worksheet_name, [{"range": cell_range, "values": cell["values"]}])
+
+def _plan_point_updates(updates: list) -> dict:
+    """
+    Resolve point updates to cells through the mirrors.
+    Returns {(worksheet name, row, column): [(amount, is_add), ...]} in update order.
+    """
+    operations = {}
+    for upd in updates:
+        row_index = get_row_by_username(upd["sheet"], upd["username"])
+        if not row_index:
+            print(f"User {upd['username']} not found in {upd['sheet']} sheet")
+            continue
+        mirror = _mirror_for_worksheet(upd["worksheet_name"])
+        headers = [upd["header"]]
+        if upd["header"] in ["EP", "CEP"]:
+            headers.append(f"Total {upd['header']}")
+        for header in headers:
+            col_index = mirror.column_index(row_index, header) if mirror else None
             if not col_index:
-                print(f"Header '{upd['header']}' not found for {upd['username']}")
+                if header == upd["header"]:
+                    print(f"Header '{header}' not found for {upd['username']}")
+                    break
                 continue
-            current_value = worksheet.cell(row_index, col_index).value
-            try:
-                current_value = int(current_value)
-            except (ValueError, TypeError):
-                current_value = 0
-            if upd["is_add"]:
-                new_value = current_value + upd["amount"]
-            else:
-                new_value = max(0, current_value - upd["amount"])
-            cell_ref = gspread.utils.rowcol_to_a1(row_index, col_index)
-            cell_updates.append({
-                "range": cell_ref,
-                "values": [[new_value]]
-            })
-            if upd["header"] in ["EP", "CEP"]:
-                total_header = f"Total {upd['header']}"
-                total_col_index = get_column_index(worksheet, row_index, total_header)
-                if total_col_index:
-                    total_current_value = worksheet.cell(row_index, total_col_index).value
-                    try:
-                        total_current_value = int(total_current_value)
-                    except (ValueError, TypeError):
-                        total_current_value = 0
-                    if upd["is_add"]:
-                        total_new_value = total_current_value + upd["amount"]
-                    else:
-                        total_new_value = max(0, total_current_value - upd["amount"])
-                    total_cell_ref = gspread.utils.rowcol_to_a1(row_index, total_col_index)
-                    cell_updates.append({
-                        "range": total_cell_ref,
-                        "values": [[total_new_value]]
-                    })
-        if cell_updates:
-            worksheet.batch_update(cell_updates)
-
-@retry_with_backoff
+            target = (upd["worksheet_name"], row_index, col_index)
+            operations.setdefault(target, []).append((upd["amount"], upd["is_add"]))
+    return operations
+
+def _mirror_for_worksheet(worksheet_name):
+    """Return the loaded mirror whose worksheet is `worksheet_name`, or None."""
+    for mirror in mirrors.values():
+        if mirror.worksheet_name == worksheet_name:
+            return get_mirror(mirror.sheet_key)
+    return None
+
+def _mirror_writes(worksheet_name, cell_updates):
+    """Apply A1-addressed cell writes to the mirror of `worksheet_name`, if there is one."""
+    for mirror in mirrors.values():
+        if mirror.worksheet_name == worksheet_name:
+            for upd in cell_updates:
+                row_index, col_index = gspread.utils.a1_to_rowcol(upd["range"])
+                mirror.set_cell(row_index, col_index, upd["values"][0][0])
+
+def read_stat_cells(sheetName):
+    """
+    Reload the mirror of `sheetName` with one read and return every numeric
+    stat in it as {(username, header): value}.
+    """
+    mirror = mirrors[sheetName]
+    mirror.load(open_worksheet(sheetName, mirror.worksheet_name))
+    cells = {}
+    for username, header, value in mirror.records(USERNAME_COLUMN):
+        try:
+            cells[(username, header)] = int(value)
+        except ValueError:
+            continue
+    return cells
+
+def write_stat_cells(sheetName, cells):
+    """
+    Write absolute stat values, given as (username, header, value), with one
+    `values.batchUpdate`. Returns (written cells, (username, header) pairs whose
+    column does not exist). Users that are not on the sheet yet are left out of both.
+    """
+    mirror = get_mirror(sheetName)
+    data, written, unknown = [], [], []
+    for username, header, value in cells:
+        row_index = mirror.find(username)
+        if not row_index:
+            continue
+        col_index = mirror.column_index(row_index, header)
+        if not col_index:
+            unknown.append((username, header))
+            continue
+        cell_ref = gspread.utils.rowcol_to_a1(row_index, col_index)
+        data.append({"range": gspread.utils.absolute_range_name(mirror.worksheet_name, cell_ref), "values": [[value]]})
+        written.append((username, header, value))
+
+    if data:
+        open_spreadsheet(sheetName).values_batch_update({"valueInputOption": "RAW", "data": data})
+        _mirror_writes(mirror.worksheet_name, [{"range": upd["range"].split("!", 1)[1], "values": upd["values"]} for upd in data])
+        if mirror.worksheet_name == quota_snapshot.worksheet_name:
+            quota_snapshot.invalidate()
+    return written, unknown
+
+def poll_mirror_changes():
+    """
+    Check every loaded mirror for hand edits with one `values.batchGet` per
+    spreadsheet, covering the username column, the quota columns and the header
+    rows. Header rows and probed values are patched in place; a mirror whose
+    username column changed is reloaded. The quota snapshot is only invalidated
+    when its rows or columns changed. Returns {sheet key: set of changes}.
+    """
+    grouped = {}
+    for key, mirror in mirrors.items():
+        if mirror.loaded_at is not None and mirror.probe_columns:
+            grouped.setdefault(sheets[key], []).append((key, mirror))
+
+    results = {}
+    for group in grouped.values():
+        probe_ranges = [mirror.probe_ranges() for _, mirror in group]
+        response = open_spreadsheet(group[0][0]).values_batch_get([r for ranges in probe_ranges for r in ranges])
+        value_ranges = response.get("valueRanges", [])
+        offset = 0
+        for (key, mirror), ranges in zip(group, probe_ranges):
+            changes = mirror.apply_probe(value_ranges[offset:offset + len(ranges)])
+            offset += len(ranges)
+            if "rows" in changes:
+                mirror.load(open_worksheet(key, mirror.worksheet_name))
+            if mirror.worksheet_name == quota_snapshot.worksheet_name and changes & {"rows", "values"}:
+                quota_snapshot.invalidate()
+            if changes:
+                print(f"Detected changes in '{mirror.worksheet_name}': {', '.join(sorted(changes))}")
+            results[key] = changes
+    return results
+
 def add_new_user(sheetName, username):
     """
     Adiciona um novo usuário à planilha especificada.
@@ -89,10 +252,12 @@ def add_new_user(sheetName, username):
     - `username`: Nome de usuário a ser adicionado.
     """
     try:
-        spreadsheet = client.open_by_key(sheets[sheetName])
-        worksheet = spreadsheet.worksheet("Main Sheet" if sheetName == "Main" else "Officer Sheet")
+        worksheet = open_worksheet(sheetName, "Main Sheet" if sheetName == "Main" else "Officer Sheet")
         
-        worksheet.insert_row([None, None, None, username, 0, 0, 0], index=128)
+        new_row = [None, None, None, username, 0, 0, 0]
+        worksheet.insert_row(new_row, index=128)
+        mirrors[sheetName].insert_row(128, new_row)
+        quota_snapshot.invalidate()
         
         
         cell_ref = gspread.utils.rowcol_to_a1(128, 4)
@@ -107,22 +272,38 @@ def add_new_user(sheetName, username):
     except Exception as e:
         print(f"Error adding user {username}: {e}")
 
-@retry_with_backoff
-@lru_cache(maxsize=128)
 def get_column_index(worksheet, user_row, header_name):
     """
-    Search from the given row upward for the header row containing header_name.
+    Look up the column of header_name for the section containing user_row in the
+    worksheet's mirrored header map. No API call is made once the mirror is loaded.
     Returns the column index (1-indexed) of header_name, or None if not found.
     """
-    for header_row in range(user_row, 0, -1):
-        row_values = worksheet.row_values(header_row)
-        if header_name in row_values:
-            return row_values.index(header_name) + 1
+    mirror = _mirror_for_worksheet(worksheet.title)
+    col_index = mirror.column_index(user_row, header_name) if mirror else None
+    if col_index:
+        return col_index
     print(f"Header '{header_name}' not found above row {user_row}")
     return None
 
-@retry_with_backoff
-@lru_cache(maxsize=128)
+def get_mirror(sheetName):
+    """Return the loaded mirror for the "Main" or "Officer" sheet, reloading it if stale."""
+    key = "Officer" if sheetName.lower() == "officer" else "Main" if sheetName.lower() == "main" else None
+    if key is None:
+        raise KeyError(f"No mirror for sheet '{sheetName}'")
+    mirror = mirrors[key]
+    if mirror.is_stale():
+        mirror.load(open_worksheet(key, mirror.worksheet_name))
+    return mirror
+
+def _find_in_mirror(sheetName, username):
+    """Look up `username` in the mirror, reloading once if it is missing and the copy is old enough."""
+    mirror = get_mirror(sheetName)
+    row_index = mirror.find(username)
+    if not row_index and mirror.can_refresh_on_miss():
+        mirror.load(open_worksheet(mirror.sheet_key, mirror.worksheet_name))
+        row_index = mirror.find(username)
+    return row_index
+
 def get_row_by_username(sheetName, username):
     """Find the row containing the username in the given sheet.
     
@@ -131,29 +312,78 @@ def get_row_by_username(sheetName, username):
       - If sheetName is "Main", the worksheet "Main Sheet" is used.
     """
     try:
-        spreadsheet = client.open_by_key(sheets[sheetName])
-
-        if sheetName.lower() == "officer":
-            worksheet_name = "Officer Sheet"
-        elif sheetName.lower() == "main": 
-            worksheet_name = "Main Sheet"
-            
-        worksheet = spreadsheet.worksheet(worksheet_name)
-        all_values = worksheet.get_all_values()
-        
-        for row_index, row in enumerate(all_values):
-            if username in row:
-                return row_index + 1
-        print(f"Username '{username}' not found in sheet '{sheetName}'.")
-        return None
+        row_index = _find_in_mirror(sheetName, username)
+        if not row_index:
+            print(f"Username '{username}' not found in sheet '{sheetName}'.")
+            return None
+        return row_index
     
     except Exception as e:
+        if retry_policy.is_retryable(e):
+            raise
         print(f"An error occurred: {e}")
         return None
 
-client = gspread.authorize(CREDS)
+client = None
+init_timings = {}
+_init_lock = threading.Lock()
+_spreadsheets = {}
+_worksheets = {}
+_handles_lock = threading.Lock()
+
+def init_sheets():
+    """
+    Load the service-account credentials and authorize the gspread client.
+    Runs once, on first use or from the bot's `setup_hook`. Every Sheets request,
+    including grid-data reads, goes through this client's single HTTP session.
+    """
+    global client
+    with _init_lock:
+        if client is not None:
+            return
+        started_at = time.perf_counter()
+        creds = Credentials.from_service_account_file(CREDS_FILE, scopes=SCOPES)
+        loaded_at = time.perf_counter()
+        client = gspread.authorize(creds, http_client=ThrottledHTTPClient)
+        authorized_at = time.perf_counter()
+        init_timings.update({
+            "credentials_ms": round((loaded_at - started_at) * 1000, 2),
+            "gspread_ms": round((authorized_at - loaded_at) * 1000, 2),
+        })
+        print(f"Google Sheets client initialized in {(authorized_at - started_at) * 1000:.0f}ms")
+
+def get_client():
+    if client is None:
+        init_sheets()
+    return client
 
-service = build("sheets", "v4", credentials=CREDS)
+def open_spreadsheet(sheetName):
+    """Return the pooled Spreadsheet handle for `sheetName`, opening it on first use."""
+    spreadsheet_id = sheets[sheetName]
+    with _handles_lock:
+        spreadsheet = _spreadsheets.get(spreadsheet_id)
+    if spreadsheet is None:
+        spreadsheet = get_client().open_by_key(spreadsheet_id)
+        with _handles_lock:
+            spreadsheet = _spreadsheets.setdefault(spreadsheet_id, spreadsheet)
+    return spreadsheet
+
+def open_worksheet(sheetName, worksheet_name):
+    """Return the pooled Worksheet handle keyed by (spreadsheet ID, worksheet title)."""
+    key = (sheets[sheetName], worksheet_name)
+    with _handles_lock:
+        worksheet = _worksheets.get(key)
+    if worksheet is None:
+        worksheet = open_spreadsheet(sheetName).worksheet(worksheet_name)
+        with _handles_lock:
+            worksheet = _worksheets.setdefault(key, worksheet)
+    return worksheet
+
+def reset_handles():
+    """Forget every pooled handle so the next call reopens them."""
+    with _handles_lock:
+        _spreadsheets.clear()
+        _worksheets.clear()
 
 sheets = {
     "Main": "1bzZk0w_oxKDkhHOjJ6MQd9D6-SfqG4a1bvRXzj938dY",
@@ -161,6 +391,21 @@ sheets = {
     "Leaderboard": "1bzZk0w_oxKDkhHOjJ6MQd9D6-SfqG4a1bvRXzj938dY"
 }
 
+quota_snapshot = ColorSnapshot("Main Sheet", 4, 7, QUOTA_SNAPSHOT_TTL)
+
+mirrors = {
+    "Main": WorksheetMirror(
+        "Main", "Main Sheet", SHEET_MIRROR_TTL, SHEET_MIRROR_MISS_REFRESH,
+        header_rows=MAIN_SHEET_HEADER_ROWS, header_anchor="EP",
+        probe_columns=(USERNAME_COLUMN, quota_snapshot.last_col),
+    ),
+    "Officer": WorksheetMirror(
+        "Officer", "Officer Sheet", SHEET_MIRROR_TTL, SHEET_MIRROR_MISS_REFRESH,
+        header_rows=OFFICER_SHEET_HEADER_ROWS, header_anchor="OP",
+        probe_columns=(USERNAME_COLUMN, USERNAME_COLUMN),
+    ),
+}
+
 def rgb_to_hex(red, green, blue):
     """Convert RGB values (0-1 range) to a hex color code."""
     r = int(red * 255)
@@ -168,34 +413,64 @@ def rgb_to_hex(red, green, blue):
     b = int(blue * 255)
     return f"#{r:02x}{g:02x}{b:02x}"
 
-@retry_with_backoff
-def get_background_color(sheetName, cell_range):
-    """Get the background color of a cell in hex format."""
-    try:
-        spreadsheet_id = sheets[sheetName]
-        sheet_metadata = service.spreadsheets().get(
-            spreadsheetId=spreadsheet_id,
-            ranges=[cell_range],
-            includeGridData=True
-        ).execute()
-        
-        grid_data = sheet_metadata["sheets"][0]["data"][0]["rowData"][0]["values"][0]
-        if "effectiveFormat" in grid_data:
-            bg_color = grid_data["effectiveFormat"]["backgroundColor"]
-            hex_color = rgb_to_hex(bg_color.get("red", 1), bg_color.get("green", 1), bg_color.get("blue", 1))
-            return hex_color
-        else:
-            return None
-    
-    except Exception as e:
-        print(f"An error occurred: {e}")
+def _color_to_hex(bg_color):
+    """Convert an API colour dict to hex; the API omits channels that are 0."""
+    return rgb_to_hex(bg_color.get("red", 0), bg_color.get("green", 0), bg_color.get("blue", 0))
+
+def get_quota_snapshot():
+    """
+    Return the colour snapshot of the Main Sheet quota columns, reloading it if
+    stale. A stale snapshot keeps being served while the read budget is low.
+    """
+    if quota_snapshot.is_stale() and (not quota_snapshot.codes or quota_accountant.allow_low_priority("read")):
+        first = gspread.utils.rowcol_to_a1(1, quota_snapshot.first_col)[:-1]
+        last = gspread.utils.rowcol_to_a1(1, quota_snapshot.last_col)[:-1]
+        sheet_data = open_spreadsheet("Main").fetch_sheet_metadata({
+            "ranges": gspread.utils.absolute_range_name(quota_snapshot.worksheet_name, f"{first}:{last}"),
+            "includeGridData": "true",
+            "fields": "sheets(data(rowData(values(effectiveFormat/backgroundColor))))"
+        })
+        quota_snapshot.load(sheet_data["sheets"][0]["data"][0].get("rowData", []), _color_to_hex)
+    return quota_snapshot
+
+def get_quota_row(username):
+    """
+    Return (value, status code) for each quota column of the username's Main
+    Sheet row, served from the mirror and the colour snapshot.
+    Returns None if the user is not found.
+    """
+    row_index = get_row_by_username("Main", username)
+    if not row_index:
         return None
+    snapshot = get_quota_snapshot()
+    mirror = get_mirror("Main")
+    use_store = LOCAL_STORE_ENABLED and point_store.is_loaded("Main")
+
+    def value(col_index):
+        if use_store:
+            header = mirror.header_name(row_index, col_index)
+            stored = point_store.get("Main", username, header) if header else None
+            if stored is not None:
+                return stored
+        return mirror.cell(row_index, col_index) or None
+
+    return [
+        (value(col_index), snapshot.status(row_index, col_index))
+        for col_index in range(snapshot.first_col, snapshot.last_col + 1)
+    ]
 
 def get_main_stat(username, header_name):
-    """Get the value of a user's stat (EP/CEP) from the Main sheet."""
+    """Get the value of a user's stat (EP/CEP) from the Main sheet, or from the local store when enabled."""
+    if LOCAL_STORE_ENABLED and point_store.is_loaded("Main"):
+        value = point_store.get("Main", username, header_name)
+        if value is not None:
+            return value
+        if point_store.has_user("Main", username) or get_row_by_username("Main", username):
+            return 0
+        print(f"User {username} not found in Main sheet")
+        return None
     try:
-        spreadsheet = client.open_by_key(sheets["Main"])
-        worksheet = spreadsheet.worksheet("Main Sheet")
+        worksheet = open_worksheet("Main", "Main Sheet")
         
         row_index = get_row_by_username("Main", username)
         if not row_index:
@@ -213,38 +488,11 @@ def get_main_stat(username, header_name):
         except (ValueError, TypeError):
             return 0
     except Exception as e:
+        if retry_policy.is_retryable(e):
+            raise
         print(f"Error getting '{header_name}' for {username}: {e}")
         return None
 
-def update_officer_stat(worksheet, row_index, header_name, amount, is_add=True):
-    """Helper function to update a numeric stat for an officer in the given column.
-    
-    - If `is_add` is True, it adds the amount.
-    - If `is_add` is False, it subtracts the amount but ensures the value doesn't go below zero.
-    """
-    try:
-        col_index = get_column_index(worksheet, row_index, header_name)
-        if not col_index:
-            print(f"Header '{header_name}' not found")
-            return False
-        
-        current_value = worksheet.cell(row_index, col_index).value
-        try:
-            new_value = int(current_value)
-        except (ValueError, TypeError):
-            new_value = 0
-
-        if is_add:
-            new_value += amount
-        else:
-            new_value = max(0, new_value - amount)
-
-        worksheet.update_cell(row_index, col_index, new_value)
-        return True
-    except Exception as e:
-        print(f"Error updating '{header_name}': {e}")
-        return False
-
 def find_user_sheet(username):
     """
     Search for the given username in the Officer and Main sheets.
@@ -253,129 +501,19 @@ def find_user_sheet(username):
         - "Main" if the user is not in the Officer Sheet but is found in the Main Sheet.
         - None if the user is not found in either sheet.
     """
-    sheet_priority = [
-        ("Officer", "Officer Sheet"),
-        ("Main", "Main Sheet")
-    ]
-    
-    for key, worksheet_name in sheet_priority:
+    for key in ("Officer", "Main"):
         try:
-            spreadsheet = client.open_by_key(sheets[key])
-            worksheet = spreadsheet.worksheet(worksheet_name)
-            all_values = worksheet.get_all_values()
-            for row in all_values:
-                if username in row:
-                    return key
+            if _find_in_mirror(key, username):
+                return key
         except Exception as e:
+            if retry_policy.is_retryable(e):
+                raise
             print(f"Error checking sheet {key}: {e}")
     return None
 
-def get_cell_color(sheetName, username, column_identifier):
-    """
-    Get the background color of a cell in the username's row.
-    - `column_identifier`: Column name (e.g., "May") or 1-based index (e.g., 5).
-    """
-    try:
-        row_index = get_row_by_username(sheetName, username)
-        if not row_index:
-            return None
-        
-        spreadsheet = client.open_by_key(sheets[sheetName])
-        worksheet = spreadsheet.worksheet("Main Sheet")
-        
-        if isinstance(column_identifier, str):
-            headers = worksheet.row_values(1)
-            try:
-                col_index = headers.index(column_identifier) + 1
-            except ValueError:
-                print(f"Column '{column_identifier}' not found.")
-                return None
-        else:
-            col_index = column_identifier
-        
-        cell_ref = gspread.utils.rowcol_to_a1(row_index, col_index)
-        cell_range = f"Main Sheet!{cell_ref}"
-        
-        return get_background_color(sheetName, cell_range)
-    
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        return None
-    
-def add_ep(username, amount):
-    update_main_stat(username, "Total EP", amount, is_add=True)
-    return update_main_stat(username, "EP", amount, is_add=True)
-
-def remove_ep(username, amount):
-    update_main_stat(username, "Total EP", amount, is_add=False)
-    return update_main_stat(username, "EP", amount, is_add=False)
-
 def get_ep(username):
     return get_main_stat(username, "EP")
 
-def add_cep(username, amount):
-    """Add CEP to a user's total"""
-    update_main_stat(username, "Total CEP", amount, is_add=True)
-    return update_main_stat(username, "CEP", amount, is_add=True)
-
-def remove_cep(username, amount):
-    """Remove CEP from a user's total"""
-    update_main_stat(username, "Total CEP", amount, is_add=False)
-    return update_main_stat(username, "CEP", amount, is_add=False)
-
 def get_cep(username):
     """Get the CEP value of a user"""
     return get_main_stat(username, "CEP")
-    
-def add_events_hosted(username, amount, event_type):
-    """Add event-hosting points (OP) to an officer's total."""
-    try:
-        spreadsheet = client.open_by_key(sheets["Officer"])
-        worksheet = spreadsheet.worksheet("Officer Sheet")
-        
-        row_index = get_row_by_username("Officer", username)
-        if not row_index:
-            print(f"User {username} not found in Officer sheet")
-            return False
-        
-        update_officer_stat(worksheet, row_index, "OP", amount)
-
-        event_columns = {
-            "Company": "Company Events Hosted",
-            "Wide": "Events Hosted"
-        }
-        
-        if event_type in event_columns:
-            update_officer_stat(worksheet, row_index, event_columns[event_type], amount)
-
-        return True
-    except Exception as e:
-        print(f"Error in add_events_hosted: {e}")
-        return False
-
-
-def remove_events_hosted(username, amount, event_type):
-    """Remove event-hosting points (OP) from an officer's total."""
-    try:
-        spreadsheet = client.open_by_key(sheets["Officer"])
-        worksheet = spreadsheet.worksheet("Officer Sheet")
-        
-        row_index = get_row_by_username("Officer", username)
-        if not row_index:
-            print(f"User {username} not found in Officer sheet")
-            return False
-        
-        update_officer_stat(worksheet, row_index, "OP", amount, is_add=False)
-
-        event_columns = {
-            "Company": "Company Events Hosted",
-            "Wide": "Events Hosted"
-        }
-        
-        if event_type in event_columns:
-            update_officer_stat(worksheet, row_index, event_columns[event_type], amount, is_add=False)
-
-        return True
-    except Exception as e:
-        print(f"Error in remove_events_hosted: {e}")
-        return False
\ No newline at end of file
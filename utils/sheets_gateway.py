@@ -0,0 +1,110 @@
+import asyncio
+import contextvars
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import SHEETS_MAX_WORKERS
+from utils.metrics import metrics
+from utils.rate_limit import retry_policy, sheets_bucket
+
+class SheetsGateway:
+    """
+    Run the blocking helpers from `utils.sheets` on a bounded worker pool so
+    cogs can await them without stalling the Discord event loop.
+
+    Rate-limited and transient failures are retried according to `policy` by
+    running the whole callable again, so a callable that writes must be safe
+    to rerun (e.g. write absolute values it was given rather than read, modify
+    and write). Calls wait until `bucket` holds a token for them and for every
+    call already running before they are handed to a worker. Both waits are
+    awaited on the event loop, so a drained bucket after a 429 holds calls in
+    the queue instead of parking every worker thread. Each request still takes
+    its token in the worker (`ThrottledHTTPClient`), so a helper that sends
+    several requests in a burst can block its worker briefly.
+
+    Calls run in a copy of the caller's context, so the Sheets requests they
+    make are attributed to the command that awaited them.
+
+    :param max_workers: Maximum number of Sheets calls running at once.
+    :param policy: Retry policy shared by every call.
+    :param bucket: Token bucket the requests of every call draw from.
+    """
+
+    def __init__(self, max_workers: int, policy, bucket):
+        self.max_workers = max_workers
+        self.policy = policy
+        self.bucket = bucket
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sheets")
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self.queued = 0
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+        self.total_wait = 0.0
+        self.total_run = 0.0
+
+    async def run(self, func, *args, **kwargs):
+        """Await `func(*args, **kwargs)` on the worker pool and return its result."""
+        attempt = 0
+        while True:
+            try:
+                return await self._run_once(func, *args, **kwargs)
+            except Exception as e:
+                delay = self.policy.next_delay(e, attempt)
+                if delay is None:
+                    raise
+                self.retries += 1
+                metrics.record_retry()
+                attempt += 1
+                print(f"Sheets call {getattr(func, '__name__', func)} failed ({e}), retrying in {delay:.1f} seconds...")
+                await asyncio.sleep(delay)
+
+    async def _run_once(self, func, *args, **kwargs):
+        self.queued += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queued)
+        enqueued_at = time.perf_counter()
+        try:
+            while (delay := self.bucket.wait_time(self.in_flight + 1)) > 0:
+                await asyncio.sleep(delay)
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        started_at = time.perf_counter()
+        self.total_wait += started_at - enqueued_at
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            context = contextvars.copy_context()
+            result = await loop.run_in_executor(self._executor, context.run, functools.partial(func, *args, **kwargs))
+            self.completed += 1
+            return result
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self.total_run += time.perf_counter() - started_at
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        """Return queue-depth and timing metrics for the worker pool."""
+        finished = self.completed + self.failed
+        return {
+            "max_workers": self.max_workers,
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "max_queue_depth": self.max_queue_depth,
+            "completed": self.completed,
+            "failed": self.failed,
+            "retries": self.retries,
+            "avg_wait_ms": round(self.total_wait / finished * 1000, 2) if finished else 0.0,
+            "avg_run_ms": round(self.total_run / finished * 1000, 2) if finished else 0.0,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+sheets_gateway = SheetsGateway(SHEETS_MAX_WORKERS, retry_policy, sheets_bucket)
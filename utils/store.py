@@ -0,0 +1,232 @@
+import sqlite3
+import threading
+import time
+from config import LEDGER_PATH
+
+class PointStore:
+    """
+    Local copy of every numeric stat on the point sheets, used as the source of
+    truth when `LOCAL_STORE_ENABLED` is set.
+
+    Each (sheet, username, header) keeps its current `value` and the
+    `synced_value` last read from or written to the sheet. Local changes mark a
+    stat dirty until the sync engine has pushed it. Values pulled from the sheet
+    are merged three-way: a hand edit on the sheet moves the base, and local
+    changes made since the last sync are re-applied on top of it.
+
+    The store lives in the ledger's SQLite file, so the ledger can apply its
+    deltas and mark them flushed in one transaction (`PointLedger.mark_flushed`).
+    The file is only opened on first use, so a bot running without the store
+    never touches its tables.
+
+    :param path: Path of the SQLite file shared with the ledger.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+        self.applied = 0
+        self.pushed = 0
+        self.hand_edits = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database and create the store's tables on first use."""
+        with self._lock:
+            if self._conn is None:
+                conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS stats (
+                        sheet TEXT NOT NULL,
+                        username TEXT NOT NULL,
+                        header TEXT NOT NULL,
+                        value INTEGER NOT NULL,
+                        synced_value INTEGER,
+                        dirty INTEGER NOT NULL DEFAULT 0,
+                        updated_at REAL NOT NULL,
+                        PRIMARY KEY (sheet, username, header)
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_stats_rank ON stats (sheet, header, value)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_stats_dirty ON stats (sheet, dirty)")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS sync_state (
+                        sheet TEXT PRIMARY KEY,
+                        pulled_at REAL NOT NULL
+                    )
+                """)
+                self._conn = conn
+            return self._conn
+
+    def is_loaded(self, sheet: str) -> bool:
+        """Return True once `sheet` has been pulled at least once."""
+        conn = self._connection()
+        with self._lock:
+            return conn.execute("SELECT 1 FROM sync_state WHERE sheet = ?", (sheet,)).fetchone() is not None
+
+    def get(self, sheet: str, username: str, header: str) -> int | None:
+        conn = self._connection()
+        with self._lock:
+            row = conn.execute(
+                "SELECT value FROM stats WHERE sheet = ? AND username = ? AND header = ?",
+                (sheet, username, header),
+            ).fetchone()
+        return row[0] if row else None
+
+    def has_user(self, sheet: str, username: str) -> bool:
+        """Return True if any stat of `username` is stored."""
+        conn = self._connection()
+        with self._lock:
+            row = conn.execute(
+                "SELECT 1 FROM stats WHERE sheet = ? AND username = ? LIMIT 1",
+                (sheet, username),
+            ).fetchone()
+        return row is not None
+
+    def top(self, sheet: str, header: str, limit: int) -> list[tuple[str, int]]:
+        """Return the `limit` highest (username, value) pairs for `header`."""
+        conn = self._connection()
+        with self._lock:
+            return conn.execute(
+                "SELECT username, value FROM stats WHERE sheet = ? AND header = ? "
+                "ORDER BY value DESC, username LIMIT ?",
+                (sheet, header, limit),
+            ).fetchall()
+
+    def apply(self, conn: sqlite3.Connection, updates: list) -> int:
+        """
+        Apply `plan_point_writes`-style updates and return how many stats changed.
+        EP/CEP updates also move the matching "Total" stat, and removals are clamped
+        at zero, as on the sheet.
+
+        Runs inside the caller's open transaction on `conn`, so the ledger can
+        mark the applied deltas flushed atomically (`PointLedger.mark_flushed`).
+        """
+        self._connection()
+        now = time.time()
+        changed = 0
+        for upd in updates:
+            headers = [upd["header"]]
+            if upd["header"] in ["EP", "CEP"]:
+                headers.append(f"Total {upd['header']}")
+            for header in headers:
+                row = conn.execute(
+                    "SELECT value FROM stats WHERE sheet = ? AND username = ? AND header = ?",
+                    (upd["sheet"], upd["username"], header),
+                ).fetchone()
+                current = row[0] if row else 0
+                value = current + upd["amount"] if upd["is_add"] else max(0, current - upd["amount"])
+                conn.execute(
+                    "INSERT INTO stats (sheet, username, header, value, dirty, updated_at) VALUES (?, ?, ?, ?, 1, ?) "
+                    "ON CONFLICT(sheet, username, header) DO UPDATE SET "
+                    "value = excluded.value, dirty = 1, updated_at = excluded.updated_at",
+                    (upd["sheet"], upd["username"], header, value, now),
+                )
+                changed += 1
+        self.applied += changed
+        return changed
+
+    def dirty(self, sheet: str) -> list[tuple[str, str, int]]:
+        """Return the (username, header, value) stats of `sheet` that still need pushing."""
+        conn = self._connection()
+        with self._lock:
+            return conn.execute(
+                "SELECT username, header, value FROM stats WHERE sheet = ? AND dirty = 1",
+                (sheet,),
+            ).fetchall()
+
+    def mark_synced(self, sheet: str, cells: list[tuple[str, str, int]]):
+        """Record that `cells` were written to the sheet with the given values."""
+        conn = self._connection()
+        with self._lock:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "UPDATE stats SET synced_value = ?, dirty = (value != ?) "
+                "WHERE sheet = ? AND username = ? AND header = ?",
+                [(value, value, sheet, username, header) for username, header, value in cells],
+            )
+            conn.execute("COMMIT")
+        self.pushed += len(cells)
+
+    def forget(self, sheet: str, keys: list[tuple[str, str]]):
+        """Drop stats that have no column on the sheet."""
+        conn = self._connection()
+        with self._lock:
+            conn.executemany(
+                "DELETE FROM stats WHERE sheet = ? AND username = ? AND header = ?",
+                [(sheet, username, header) for username, header in keys],
+            )
+
+    def merge_pulled(self, sheet: str, cells: dict) -> int:
+        """
+        Merge the numeric stats read from `sheet`, given as {(username, header): value},
+        and return how many of them had been edited by hand since the last sync.
+        Stats that disappeared from the sheet are dropped unless they were
+        created locally and never pushed.
+        """
+        conn = self._connection()
+        now = time.time()
+        hand_edits = 0
+        with self._lock:
+            conn.execute("BEGIN")
+            known = {
+                (username, header): (value, synced_value, dirty)
+                for username, header, value, synced_value, dirty in conn.execute(
+                    "SELECT username, header, value, synced_value, dirty FROM stats WHERE sheet = ?",
+                    (sheet,),
+                )
+            }
+            rows = []
+            for (username, header), sheet_value in cells.items():
+                value, synced_value, dirty = known.pop((username, header), (None, None, 0))
+                if synced_value is not None and sheet_value != synced_value:
+                    hand_edits += 1
+                if dirty:
+                    value = max(0, sheet_value + value - (synced_value or 0))
+                else:
+                    value = sheet_value
+                rows.append((sheet, username, header, value, sheet_value, int(value != sheet_value), now))
+            conn.executemany(
+                "INSERT OR REPLACE INTO stats (sheet, username, header, value, synced_value, dirty, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.executemany(
+                "DELETE FROM stats WHERE sheet = ? AND username = ? AND header = ?",
+                [
+                    (sheet, username, header)
+                    for (username, header), (_, synced_value, dirty) in known.items()
+                    if not dirty or synced_value is not None
+                ],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_state (sheet, pulled_at) VALUES (?, ?)",
+                (sheet, now),
+            )
+            conn.execute("COMMIT")
+        self.hand_edits += hand_edits
+        return hand_edits
+
+    def stats(self) -> dict:
+        conn = self._connection()
+        with self._lock:
+            (stored, dirty) = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(dirty), 0) FROM stats"
+            ).fetchone()
+        return {
+            "stored": stored,
+            "dirty": dirty,
+            "applied": self.applied,
+            "pushed": self.pushed,
+            "hand_edits": self.hand_edits,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+point_store = PointStore(LEDGER_PATH)
@@ -0,0 +1,48 @@
+import asyncio
+from config import STORE_SYNC_INTERVAL
+from utils.leaderboard import leaderboard_cache
+from utils.locks import sheet_locks
+from utils.rate_limit import quota_accountant
+from utils.sheets import read_stat_cells, write_stat_cells
+from utils.store import point_store
+
+STORE_SHEETS = ("Main", "Officer")
+
+async def sync_sheet(gateway, sheet: str) -> dict:
+    """
+    Pull `sheet` into the local store, then push every dirty stat back to it.
+    Runs under the sheet's lock so no ledger flush or row insert interleaves.
+    """
+    async with sheet_locks.hold(sheet):
+        cells = await gateway.run(read_stat_cells, sheet)
+        hand_edits = point_store.merge_pulled(sheet, cells)
+        dirty = point_store.dirty(sheet)
+        written, unknown = await gateway.run(write_stat_cells, sheet, dirty) if dirty else ([], [])
+        point_store.mark_synced(sheet, written)
+        if unknown:
+            print(f"Dropping {len(unknown)} local stats with no column in {sheet} sheet: {unknown[:5]}")
+            point_store.forget(sheet, unknown)
+    if hand_edits:
+        leaderboard_cache.invalidate()
+        print(f"Pulled {hand_edits} hand edits from {sheet} sheet")
+    return {"pulled": len(cells), "hand_edits": hand_edits, "pushed": len(written)}
+
+async def sync_store(gateway) -> dict:
+    """Sync every point sheet with the local store and return per-sheet results."""
+    results = {}
+    for sheet in STORE_SHEETS:
+        try:
+            results[sheet] = await sync_sheet(gateway, sheet)
+        except Exception as e:
+            print(f"Store sync of {sheet} sheet failed, will retry: {e}")
+    return results
+
+async def run_store_sync(gateway, interval: float = STORE_SYNC_INTERVAL):
+    """
+    Sync the local store with the sheets every `interval` seconds until
+    cancelled, skipping rounds while the read or write budget is low.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        if quota_accountant.allow_low_priority("read", "write"):
+            await sync_store(gateway)